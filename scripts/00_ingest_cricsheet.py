@@ -0,0 +1,287 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - CRICSHEET INGESTION MODULE
+  Script: 00_ingest_cricsheet.py
+  Description: Parses a directory of per-match Cricsheet files
+               (JSON, or legacy YAML) in a process pool and maps
+               them onto the raw Kaggle matches / deliveries
+               schema. 01_data_cleaning.py picks the output up
+               automatically.
+============================================================
+
+Input:
+  data/raw/cricsheet/*.json | *.yaml | *.yml
+
+Output Files (appended incrementally):
+  data/raw/
+  ├── cricsheet_matches.csv      ← same columns as matches.csv
+  ├── cricsheet_deliveries.csv   ← same columns as deliveries.csv
+  └── cricsheet_manifest.csv     ← files already parsed (skipped on re-run)
+============================================================
+"""
+
+import pandas as pd
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import yaml
+except ImportError:          # only needed for legacy .yaml match files
+    yaml = None
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+RAW_DIR        = os.path.join(os.path.dirname(__file__), "..", "data", "raw")
+CRICSHEET_DIR  = os.path.join(RAW_DIR, "cricsheet")
+MATCHES_OUT    = os.path.join(RAW_DIR, "cricsheet_matches.csv")
+DELIVERIES_OUT = os.path.join(RAW_DIR, "cricsheet_deliveries.csv")
+MANIFEST_FILE  = os.path.join(RAW_DIR, "cricsheet_manifest.csv")
+
+MATCH_FILE_EXTS = (".json", ".yaml", ".yml")
+N_WORKERS       = os.cpu_count() or 1
+FLUSH_EVERY     = 200          # parsed files per incremental write
+
+MATCH_COLUMNS = [
+    "id", "season", "city", "date", "team1", "team2", "toss_winner",
+    "toss_decision", "result", "dl_applied", "winner", "win_by_runs",
+    "win_by_wickets", "player_of_match", "venue", "umpire1", "umpire2", "umpire3",
+]
+DELIVERY_COLUMNS = [
+    "match_id", "inning", "batting_team", "bowling_team", "over", "ball",
+    "batsman", "non_striker", "bowler", "is_super_over", "wide_runs",
+    "bye_runs", "legbye_runs", "noball_runs", "penalty_runs", "batsman_runs",
+    "extra_runs", "total_runs", "player_dismissed", "dismissal_kind", "fielder",
+]
+MANIFEST_COLUMNS = ["file", "match_id", "deliveries", "parsed_at"]
+
+
+# ─────────────────────────────────────────────────────────
+# 1. PER-FILE PARSING (RUNS IN WORKER PROCESSES)
+# ─────────────────────────────────────────────────────────
+def _match_id(path):
+    """Cricsheet names match files by their numeric match id."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if not stem.isdigit():
+        raise ValueError(f"file name {stem!r} is not a numeric Cricsheet match id")
+    return int(stem)
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        if path.lower().endswith(".json"):
+            return json.load(fh)
+        if yaml is None:
+            raise ImportError("PyYAML is required to ingest legacy .yaml Cricsheet files")
+        return yaml.safe_load(fh)
+
+
+def _match_row(match_id, info):
+    teams    = info.get("teams", [None, None])
+    outcome  = info.get("outcome", {})
+    by       = outcome.get("by", {})
+    toss     = info.get("toss", {})
+    date     = str(info.get("dates", [None])[0])
+    umpires  = info.get("officials", {}).get("umpires", info.get("umpires", []))
+    tv       = info.get("officials", {}).get("tv_umpires", [])
+    umpires  = list(umpires) + list(tv)
+    potm     = info.get("player_of_match", [])
+
+    if "winner" in outcome:
+        result, winner = "normal", outcome["winner"]
+    else:
+        result = outcome.get("result", "no result")
+        winner = outcome.get("eliminator")     # tie decided by super over / bowl-out
+
+    return {
+        "id"              : match_id,
+        "season"          : int(date[:4]) if date[:4].isdigit() else info.get("season"),
+        "city"            : info.get("city"),
+        "date"            : date,
+        "team1"           : teams[0],
+        "team2"           : teams[1],
+        "toss_winner"     : toss.get("winner"),
+        "toss_decision"   : toss.get("decision"),
+        "result"          : result,
+        "dl_applied"      : int(outcome.get("method") == "D/L"),
+        "winner"          : winner,
+        "win_by_runs"     : by.get("runs", 0),
+        "win_by_wickets"  : by.get("wickets", 0),
+        "player_of_match" : potm[0] if potm else None,
+        "venue"           : info.get("venue"),
+        "umpire1"         : umpires[0] if len(umpires) > 0 else None,
+        "umpire2"         : umpires[1] if len(umpires) > 1 else None,
+        "umpire3"         : umpires[2] if len(umpires) > 2 else None,
+    }
+
+
+def _delivery_row(match_id, inning, batting_team, bowling_team, over, ball,
+                  is_super_over, d, runs_batter_key):
+    runs    = d.get("runs", {})
+    extras  = d.get("extras", {})
+    wicket  = d.get("wickets", d.get("wicket"))
+    if isinstance(wicket, list):
+        wicket = wicket[0] if wicket else None
+    fielders = (wicket or {}).get("fielders", [])
+    fielder  = fielders[0] if fielders else None
+    if isinstance(fielder, dict):
+        fielder = fielder.get("name")
+
+    return {
+        "match_id"         : match_id,
+        "inning"           : inning,
+        "batting_team"     : batting_team,
+        "bowling_team"     : bowling_team,
+        "over"             : over,
+        "ball"             : ball,
+        "batsman"          : d.get("batter", d.get("batsman")),
+        "non_striker"      : d.get("non_striker"),
+        "bowler"           : d.get("bowler"),
+        "is_super_over"    : int(is_super_over),
+        "wide_runs"        : extras.get("wides", 0),
+        "bye_runs"         : extras.get("byes", 0),
+        "legbye_runs"      : extras.get("legbyes", 0),
+        "noball_runs"      : extras.get("noballs", 0),
+        "penalty_runs"     : extras.get("penalty", 0),
+        "batsman_runs"     : runs.get(runs_batter_key, 0),
+        "extra_runs"       : runs.get("extras", 0),
+        "total_runs"       : runs.get("total", 0),
+        "player_dismissed" : (wicket or {}).get("player_out"),
+        "dismissal_kind"   : (wicket or {}).get("kind"),
+        "fielder"          : fielder,
+    }
+
+
+def parse_match_file(path):
+    """Parse one Cricsheet file → (file name, match row, delivery rows).
+    Handles the current JSON layout (innings → overs → deliveries) and
+    the legacy YAML layout (innings → {"1st innings": {deliveries: [{0.1: ...}]}})."""
+    match_id = _match_id(path)
+    data     = _load(path)
+    if not isinstance(data, dict):
+        raise ValueError("not a Cricsheet match file")
+    info     = data.get("info") or {}
+    teams    = info.get("teams") or []
+    if len(teams) != 2 or not info.get("dates"):
+        raise ValueError("info.teams / info.dates missing")
+    if not data.get("innings") and "result" not in info.get("outcome", {}):
+        raise ValueError("no innings and no recorded result")
+    rows     = []
+
+    for i, innings in enumerate(data.get("innings", []), start=1):
+        if "team" not in innings and len(innings) == 1:        # legacy keyed innings
+            innings = next(iter(innings.values()))
+        batting_team  = innings.get("team")
+        bowling_team  = next((t for t in teams if t != batting_team), None)
+        is_super_over = innings.get("super_over", i > 2)
+
+        if "overs" in innings:
+            for over in innings["overs"]:
+                for ball, d in enumerate(over.get("deliveries", []), start=1):
+                    rows.append(_delivery_row(match_id, i, batting_team, bowling_team,
+                                              over["over"] + 1, ball, is_super_over, d, "batter"))
+        else:
+            ball_in_over = {}
+            for entry in innings.get("deliveries", []):
+                (key, d), = entry.items()
+                over = int(float(key)) + 1
+                ball_in_over[over] = ball_in_over.get(over, 0) + 1
+                rows.append(_delivery_row(match_id, i, batting_team, bowling_team,
+                                          over, ball_in_over[over], is_super_over, d, "batsman"))
+
+    return os.path.basename(path), _match_row(match_id, info), rows
+
+
+# ─────────────────────────────────────────────────────────
+# 2. MANIFEST + INCREMENTAL WRITES
+# ─────────────────────────────────────────────────────────
+def load_manifest(path=MANIFEST_FILE):
+    if not os.path.exists(path):
+        return set()
+    return set(pd.read_csv(path, usecols=["file"])["file"])
+
+
+def _append(df, path, columns):
+    df.reindex(columns=columns).to_csv(path, mode="a", index=False,
+                                       header=not os.path.exists(path))
+
+
+def flush(batch):
+    """Append one batch of parsed files. The manifest is written last so
+    a file is only marked done once its rows are on disk."""
+    if not batch:
+        return
+    parsed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    _append(pd.DataFrame([m for _, m, _ in batch]), MATCHES_OUT, MATCH_COLUMNS)
+    _append(pd.DataFrame([r for _, _, rows in batch for r in rows]), DELIVERIES_OUT, DELIVERY_COLUMNS)
+    _append(pd.DataFrame([{"file": f, "match_id": m["id"], "deliveries": len(rows), "parsed_at": parsed_at}
+                          for f, m, rows in batch]), MANIFEST_FILE, MANIFEST_COLUMNS)
+
+
+def ingest(src_dir=CRICSHEET_DIR, n_workers=N_WORKERS, flush_every=FLUSH_EVERY):
+    if not os.path.isdir(src_dir):
+        print(f"  ⚠️  No Cricsheet directory at {src_dir} → skipping (Kaggle-only run)")
+        return 0
+    done  = load_manifest()
+    files = sorted(
+        os.path.join(src_dir, f) for f in os.listdir(src_dir)
+        if f.lower().endswith(MATCH_FILE_EXTS) and f not in done
+    )
+    print(f"  ✔  {len(done):,} files already in manifest → {len(files):,} new files to parse")
+    if not files:
+        return 0
+
+    parsed, batch = 0, []
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = pool.map(_parse_or_error, files, chunksize=max(1, len(files) // (n_workers * 8)))
+        for path, result in zip(files, futures):
+            if isinstance(result, Exception):
+                print(f"  ⚠️  SKIPPED {os.path.basename(path)}: {result}")
+                continue
+            batch.append(result)
+            parsed += 1
+            if len(batch) >= flush_every:
+                flush(batch)
+                print(f"  ✔  {parsed:,} / {len(files):,} files written")
+                batch = []
+    flush(batch)
+    return parsed
+
+
+def _parse_or_error(path):
+    try:
+        return parse_match_file(path)
+    except Exception as exc:       # bad file shouldn't abort the whole run
+        return exc
+
+
+# ─────────────────────────────────────────────────────────
+# 3. MAIN
+# ─────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Ingest per-match Cricsheet files")
+    parser.add_argument("--src", default=CRICSHEET_DIR, help="directory of Cricsheet match files")
+    parser.add_argument("--workers", type=int, default=N_WORKERS, help="parser processes")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  IPL Analytics — Cricsheet Ingestion")
+    print("=" * 60)
+    print(f"  📂  Source : {args.src}")
+    print(f"  ⚙️   Workers: {args.workers}")
+
+    parsed = ingest(args.src, args.workers)
+
+    print(f"\n  ✔  Parsed {parsed:,} match files")
+    if os.path.exists(MATCHES_OUT):
+        print(f"  ✔  cricsheet_matches.csv    → {RAW_DIR}")
+        print(f"  ✔  cricsheet_deliveries.csv → {RAW_DIR}")
+    print("\n  📌 Next: python scripts/01_data_cleaning.py")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,11 @@ import os
 import warnings
 warnings.filterwarnings("ignore")
 
+from cleaning_rules import (
+    TEAM_NAME_MAP, TEAM_COLS_MATCHES, TEAM_COLS_DELIVERIES,
+    FILL_ZERO_COLS, DELIVERY_FILL_VALUES
+)
+
 # ─────────────────────────────────────────────────────────
 # 0. CONFIGURATION
 # ─────────────────────────────────────────────────────────
@@ -26,6 +31,10 @@ os.makedirs(PROCESSED_DIR, exist_ok=True)
 MATCHES_FILE    = os.path.join(RAW_DIR, "matches.csv")
 DELIVERIES_FILE = os.path.join(RAW_DIR, "deliveries.csv")
 
+# Optional output of 00_ingest_cricsheet.py (newer seasons / other leagues)
+CRICSHEET_MATCHES_FILE    = os.path.join(RAW_DIR, "cricsheet_matches.csv")
+CRICSHEET_DELIVERIES_FILE = os.path.join(RAW_DIR, "cricsheet_deliveries.csv")
+
 # ─────────────────────────────────────────────────────────
 # 1. LOAD RAW DATA
 # ─────────────────────────────────────────────────────────
@@ -39,6 +48,46 @@ deliveries = pd.read_csv(DELIVERIES_FILE)
 print(f"  ✔  matches.csv    loaded  → {matches.shape[0]:,} rows × {matches.shape[1]} cols")
 print(f"  ✔  deliveries.csv loaded  → {deliveries.shape[0]:,} rows × {deliveries.shape[1]} cols")
 
+
+def match_keys(df):
+    """Source-independent match key: date + sorted (standardized) team pair.
+    Kaggle ids and Cricsheet file ids differ, so ids can't identify overlaps."""
+    date = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+    date = date.fillna(pd.to_datetime(df["date"][date.isna()], dayfirst=True, errors="coerce"))
+    t1 = df["team1"].replace(TEAM_NAME_MAP).astype(str)
+    t2 = df["team2"].replace(TEAM_NAME_MAP).astype(str)
+    pair = np.where(t1 <= t2, t1 + "|" + t2, t2 + "|" + t1)
+    return date.dt.strftime("%Y-%m-%d").fillna("?") + "|" + pair
+
+
+if os.path.exists(CRICSHEET_MATCHES_FILE) and os.path.exists(CRICSHEET_DELIVERIES_FILE):
+    cs_matches    = pd.read_csv(CRICSHEET_MATCHES_FILE)
+    cs_deliveries = pd.read_csv(CRICSHEET_DELIVERIES_FILE)
+
+    # Match ids are numeric on both sides (rows from non-numeric file names are dropped)
+    cs_matches["id"]          = pd.to_numeric(cs_matches["id"], errors="coerce")
+    cs_deliveries["match_id"] = pd.to_numeric(cs_deliveries["match_id"], errors="coerce")
+    bad_ids = cs_matches["id"].isna() | cs_matches["season"].isna()
+    if bad_ids.any():
+        print(f"  ⚠️  {bad_ids.sum():,} Cricsheet matches without a numeric id / season → dropped")
+    cs_matches = cs_matches[~bad_ids].astype({"id": "int64", "season": "int64"})
+
+    # Kaggle rows win for matches present in both sources (same date + teams)
+    overlap  = match_keys(cs_matches).isin(set(match_keys(matches)))
+    id_clash = ~overlap & cs_matches["id"].isin(matches["id"])
+    print(f"  ✔  Cricsheet overlap with Kaggle → {overlap.sum():,} matches kept from Kaggle")
+    if id_clash.any():
+        print(f"  ⚠️  {id_clash.sum():,} Cricsheet matches reuse a Kaggle id for a different "
+              f"match → skipped (ids: {cs_matches.loc[id_clash, 'id'].tolist()[:10]})")
+    cs_matches    = cs_matches[~overlap & ~id_clash]
+    cs_deliveries = cs_deliveries[cs_deliveries["match_id"].isin(cs_matches["id"])]
+    if "batter" in deliveries.columns:
+        cs_deliveries = cs_deliveries.rename(columns={"batsman": "batter"})
+
+    matches    = pd.concat([matches,    cs_matches],    ignore_index=True)
+    deliveries = pd.concat([deliveries, cs_deliveries], ignore_index=True)
+    print(f"  ✔  Cricsheet files  added → {len(cs_matches):,} matches, {len(cs_deliveries):,} deliveries")
+
 # ─────────────────────────────────────────────────────────
 # 2. STANDARDIZE TEAM NAMES
 # ─────────────────────────────────────────────────────────
@@ -46,21 +95,9 @@ print("\n" + "=" * 60)
 print("  STEP 2: Standardizing Team Names")
 print("=" * 60)
 
-TEAM_NAME_MAP = {
-    # Franchise renames / historical variants
-    "Delhi Daredevils"               : "Delhi Capitals",
-    "Deccan Chargers"                : "Sunrisers Hyderabad",
-    "Rising Pune Supergiants"        : "Rising Pune Supergiant",
-    "Rising Pune Supergiants"        : "Rising Pune Supergiant",
-    "Kings XI Punjab"                : "Punjab Kings",
-    "Pune Warriors"                  : "Pune Warriors India",
-    "Kochi Tuskers Kerala"           : "Kochi Tuskers Kerala",
-    # Typo corrections
-    "Royal Challengers Bangaloru"    : "Royal Challengers Bangalore",
-}
-
-team_cols_matches    = ["team1", "team2", "toss_winner", "winner"]
-team_cols_deliveries = ["batting_team", "bowling_team"]
+# TEAM_NAME_MAP lives in cleaning_rules.py (shared with the live / ingestion stages)
+team_cols_matches    = TEAM_COLS_MATCHES
+team_cols_deliveries = TEAM_COLS_DELIVERIES
 
 for col in team_cols_matches:
     if col in matches.columns:
@@ -100,18 +137,13 @@ print("\n  [deliveries.csv] Null counts BEFORE:")
 print(deliveries.isnull().sum()[deliveries.isnull().sum() > 0].to_string())
 
 # Numeric fill – runs / wicket extras
-fill_zero_cols = [
-    "wide_runs", "bye_runs", "legbye_runs", "noball_runs",
-    "penalty_runs", "batsman_runs", "extra_runs", "total_runs"
-]
-for col in fill_zero_cols:
+for col in FILL_ZERO_COLS:
     if col in deliveries.columns:
         deliveries[col] = deliveries[col].fillna(0)
 
 # Dismissal type is NaN when batter is not out – valid, leave as is but document
-deliveries["dismissal_kind"] = deliveries["dismissal_kind"].fillna("not out")
-deliveries["player_dismissed"] = deliveries["player_dismissed"].fillna("N/A")
-deliveries["fielder"]          = deliveries["fielder"].fillna("N/A")
+for col, default in DELIVERY_FILL_VALUES.items():
+    deliveries[col] = deliveries[col].fillna(default)
 
 print("\n  [deliveries.csv] Null counts AFTER:")
 remaining_d = deliveries.isnull().sum()[deliveries.isnull().sum() > 0]
@@ -19,6 +19,7 @@ KPIs Covered:
   8.  Wickets per Bowler
   9.  Venue Win Percentage
   10. Bat First vs Chase Comparison
+  11. Precomputed Leaderboards (overall / season / team)
 ============================================================
 """
 
@@ -28,6 +29,11 @@ import os
 import warnings
 warnings.filterwarnings("ignore")
 
+from cleaning_rules import BOWLER_WICKETS
+from leaderboards import (
+    LeaderboardIndex, TOP_K, MIN_BALLS_FACED, MIN_OVERS_BOWLED, MIN_LEGAL_BALLS
+)
+
 # ─────────────────────────────────────────────────────────
 # 0. CONFIGURATION
 # ─────────────────────────────────────────────────────────
@@ -35,6 +41,8 @@ PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed
 KPI_DIR       = os.path.join(PROCESSED_DIR, "kpis")
 os.makedirs(KPI_DIR, exist_ok=True)
 
+MIN_VENUE_MATCHES = 5
+
 # ─────────────────────────────────────────────────────────
 # 1. LOAD CLEANED DATA
 # ─────────────────────────────────────────────────────────
@@ -174,13 +182,13 @@ strike_rate["strike_rate"] = (
     (strike_rate["sr_runs"] / strike_rate["sr_balls_faced"]) * 100
 ).round(2)
 
-# Filter: min 200 balls for statistical significance
-strike_rate_filtered = strike_rate[strike_rate["sr_balls_faced"] >= 200].sort_values(
-    "strike_rate", ascending=False
+# Filter: min balls for statistical significance
+strike_rate_filtered = strike_rate[strike_rate["sr_balls_faced"] >= MIN_BALLS_FACED].nlargest(
+    TOP_K, "strike_rate"
 )
 
-print(f"  ✔  Top 10 by Strike Rate (min 200 balls):")
-print(strike_rate_filtered.head(10).to_string(index=False))
+print(f"  ✔  Top {TOP_K} by Strike Rate (min {MIN_BALLS_FACED} balls):")
+print(strike_rate_filtered.to_string(index=False))
 
 strike_rate.to_csv(os.path.join(KPI_DIR, "kpi_04_strike_rate.csv"), index=False)
 print(f"\n  ✔  Saved → kpi_04_strike_rate.csv")
@@ -211,12 +219,12 @@ kpi_boundary["boundary_percentage"] = (
     (kpi_boundary["boundary_balls"] / kpi_boundary["total_balls"]) * 100
 ).round(2)
 
-kpi_boundary_filtered = kpi_boundary[kpi_boundary["total_balls"] >= 200].sort_values(
-    "boundary_percentage", ascending=False
+kpi_boundary_filtered = kpi_boundary[kpi_boundary["total_balls"] >= MIN_BALLS_FACED].nlargest(
+    TOP_K, "boundary_percentage"
 )
 
-print(f"  ✔  Top 10 by Boundary % (min 200 balls):")
-print(kpi_boundary_filtered[["batsman", "fours", "sixes", "boundary_percentage"]].head(10).to_string(index=False))
+print(f"  ✔  Top {TOP_K} by Boundary % (min {MIN_BALLS_FACED} balls):")
+print(kpi_boundary_filtered[["batsman", "fours", "sixes", "boundary_percentage"]].to_string(index=False))
 
 kpi_boundary.to_csv(os.path.join(KPI_DIR, "kpi_05_boundary_percentage.csv"), index=False)
 print(f"\n  ✔  Saved → kpi_05_boundary_percentage.csv")
@@ -241,11 +249,13 @@ kpi_economy["economy_rate"]  = (
     kpi_economy["runs_conceded"] / kpi_economy["overs_bowled"]
 ).round(2)
 
-# Filter: min 10 overs for significance
-kpi_economy_filtered = kpi_economy[kpi_economy["overs_bowled"] >= 10].sort_values("economy_rate")
+# Filter: min overs for significance
+kpi_economy_filtered = kpi_economy[kpi_economy["overs_bowled"] >= MIN_OVERS_BOWLED].nsmallest(
+    TOP_K, "economy_rate"
+)
 
-print(f"  ✔  Top 10 Best Economy (min 10 overs):")
-print(kpi_economy_filtered[["bowler", "runs_conceded", "overs_bowled", "economy_rate"]].head(10).to_string(index=False))
+print(f"  ✔  Top {TOP_K} Best Economy (min {MIN_OVERS_BOWLED} overs):")
+print(kpi_economy_filtered[["bowler", "runs_conceded", "overs_bowled", "economy_rate"]].to_string(index=False))
 
 kpi_economy.to_csv(os.path.join(KPI_DIR, "kpi_06_economy_rate.csv"), index=False)
 print(f"\n  ✔  Saved → kpi_06_economy_rate.csv")
@@ -270,12 +280,12 @@ kpi_dot["dot_ball_percentage"] = (
     (kpi_dot["dot_balls"] / kpi_dot["total_legal_balls"]) * 100
 ).round(2)
 
-kpi_dot_filtered = kpi_dot[kpi_dot["total_legal_balls"] >= 60].sort_values(
-    "dot_ball_percentage", ascending=False
+kpi_dot_filtered = kpi_dot[kpi_dot["total_legal_balls"] >= MIN_LEGAL_BALLS].nlargest(
+    TOP_K, "dot_ball_percentage"
 )
 
-print(f"  ✔  Top 10 Dot Ball % (min 60 balls):")
-print(kpi_dot_filtered[["bowler", "dot_balls", "total_legal_balls", "dot_ball_percentage"]].head(10).to_string(index=False))
+print(f"  ✔  Top {TOP_K} Dot Ball % (min {MIN_LEGAL_BALLS} balls):")
+print(kpi_dot_filtered[["bowler", "dot_balls", "total_legal_balls", "dot_ball_percentage"]].to_string(index=False))
 
 kpi_dot.to_csv(os.path.join(KPI_DIR, "kpi_07_dot_ball_percentage.csv"), index=False)
 print(f"\n  ✔  Saved → kpi_07_dot_ball_percentage.csv")
@@ -287,12 +297,7 @@ print("\n" + "=" * 60)
 print("  KPI 8: Wickets per Bowler")
 print("=" * 60)
 
-# Valid dismissal kinds (not run out which is fielder's credit)
-BOWLER_WICKETS = [
-    "caught", "bowled", "lbw", "stumped",
-    "caught and bowled", "hit wicket"
-]
-
+# BOWLER_WICKETS (valid dismissal kinds, not run out) lives in cleaning_rules.py
 bowler_wickets = deliveries[
     deliveries["dismissal_kind"].isin(BOWLER_WICKETS)
 ].groupby("bowler").size().reset_index(name="wickets")
@@ -346,7 +351,7 @@ venue_runs = deliveries.groupby("venue")["total_runs"].sum().reset_index(name="t
 kpi_venue  = kpi_venue.merge(venue_runs, on="venue", how="left")
 kpi_venue["avg_runs_per_match"] = (kpi_venue["total_runs"] / kpi_venue["total_matches"]).round(1)
 
-kpi_venue = kpi_venue[kpi_venue["total_matches"] >= 5].sort_values("total_matches", ascending=False)
+kpi_venue = kpi_venue[kpi_venue["total_matches"] >= MIN_VENUE_MATCHES].sort_values("total_matches", ascending=False)
 
 print(f"  ✔  Top Venues by matches:")
 print(kpi_venue[["venue", "total_matches", "bat_first_win_pct", "chase_win_pct", "avg_runs_per_match"]].head(10).to_string(index=False))
@@ -387,6 +392,26 @@ kpi_bat_vs_chase.to_csv(os.path.join(KPI_DIR, "kpi_10_bat_vs_chase.csv"),
 kpi_bat_chase_season.to_csv(os.path.join(KPI_DIR, "kpi_10_bat_vs_chase_season.csv"),   index=False)
 print(f"\n  ✔  Saved → kpi_10_bat_vs_chase*.csv")
 
+# ─────────────────────────────────────────────────────────
+# KPI 11 — PRECOMPUTED LEADERBOARDS
+# ─────────────────────────────────────────────────────────
+print("\n" + "=" * 60)
+print("  KPI 11: Precomputed Leaderboards")
+print("=" * 60)
+
+# Ranked indexes per metric × (overall, season, team); top-k lists for the
+# common thresholds are cached at build time, other thresholds / k values
+# are served from the same indexes via LeaderboardIndex.top_k()
+leaderboard_index = LeaderboardIndex(deliveries, k=TOP_K)
+kpi_leaderboards  = leaderboard_index.precomputed()
+
+print(f"  ✔  Indexed scopes: overall + {len(leaderboard_index.seasons)} seasons "
+      f"+ {len(leaderboard_index.teams)} teams")
+print(f"  ✔  Precomputed leaderboard rows: {len(kpi_leaderboards):,}")
+
+kpi_leaderboards.to_csv(os.path.join(KPI_DIR, "kpi_11_leaderboards.csv"), index=False)
+print(f"\n  ✔  Saved → kpi_11_leaderboards.csv")
+
 # ─────────────────────────────────────────────────────────
 # SUMMARY
 # ─────────────────────────────────────────────────────────
@@ -23,7 +23,14 @@ Output Files:
   │       ├── Sheet: KPI_DotBall
   │       ├── Sheet: KPI_Wickets
   │       ├── Sheet: KPI_Venue
-  │       └── Sheet: KPI_BatVsChase
+  │       ├── Sheet: KPI_BatVsChase
+  │       ├── Sheet: KPI_Leaderboards
+  │       ├── Sheet: KPI_BatIntervals   (04_rate_intervals.py)
+  │       ├── Sheet: KPI_BowlIntervals  (04_rate_intervals.py)
+  │       ├── Sheet: Fact_TeamRatings   (06_ratings.py)
+  │       ├── Sheet: Fact_PlayerRatings (06_ratings.py)
+  │       ├── Sheet: Fact_TeamRatingHist(06_ratings.py)
+  │       └── Sheet: Fact_Fantasy       (07_fantasy_points.py)
 ============================================================
 """
 
@@ -38,6 +45,8 @@ warnings.filterwarnings("ignore")
 # ─────────────────────────────────────────────────────────
 PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
 KPI_DIR       = os.path.join(PROCESSED_DIR, "kpis")
+RATINGS_DIR   = os.path.join(PROCESSED_DIR, "ratings")
+FANTASY_DIR   = os.path.join(PROCESSED_DIR, "fantasy")
 OUTPUT_EXCEL  = os.path.join(PROCESSED_DIR, "IPL_PowerBI_Master.xlsx")
 
 print("=" * 60)
@@ -74,6 +83,9 @@ kpi_files = {
     "KPI_Venue"      : "kpi_09_venue_win_percentage.csv",
     "KPI_BatVsChase" : "kpi_10_bat_vs_chase.csv",
     "KPI_BatChase_S" : "kpi_10_bat_vs_chase_season.csv",
+    "KPI_Leaderboards": "kpi_11_leaderboards.csv",
+    "KPI_BatIntervals": "kpi_12_batting_intervals.csv",
+    "KPI_BowlIntervals": "kpi_12_bowling_intervals.csv",
 }
 
 kpi_data = {}
@@ -83,7 +95,7 @@ for sheet_name, filename in kpi_files.items():
         kpi_data[sheet_name] = pd.read_csv(filepath)
         print(f"  ✔  {sheet_name:<20} → {kpi_data[sheet_name].shape[0]:>4} rows  |  {filename}")
     else:
-        print(f"  ⚠️  MISSING: {filename} — run 02_kpi_engineering.py first!")
+        print(f"  ⚠️  MISSING: {filename} — run the KPI scripts (02, 04+) first!")
 
 # ─────────────────────────────────────────────────────────
 # 3. BUILD POWER BI MASTER TABLES
@@ -188,6 +200,20 @@ bowler_season["economy_rate"]      = (bowler_season["runs_conceded"] / bowler_se
 bowler_season["dot_ball_pct"]      = ((bowler_season["dot_balls"] / bowler_season["legal_balls"]) * 100).round(2)
 print(f"  ✔  Bowler-Season       → {len(bowler_season):,} rows")
 
+# ── 3H. OPTIONAL STAGE FACT TABLES (04+ scripts) ──
+stage_fact_files = {
+    "Fact_TeamRatings"   : os.path.join(RATINGS_DIR, "fact_team_ratings.csv"),
+    "Fact_PlayerRatings" : os.path.join(RATINGS_DIR, "fact_player_ratings.csv"),
+    "Fact_TeamRatingHist": os.path.join(RATINGS_DIR, "team_rating_history.csv"),
+    "Fact_Fantasy"       : os.path.join(FANTASY_DIR, "fact_fantasy_points.csv"),
+}
+
+stage_facts = {}
+for sheet_name, filepath in stage_fact_files.items():
+    if os.path.exists(filepath):
+        stage_facts[sheet_name] = pd.read_csv(filepath)
+        print(f"  ✔  {sheet_name:<20}→ {len(stage_facts[sheet_name]):,} rows")
+
 # ─────────────────────────────────────────────────────────
 # 4. EXPORT TO EXCEL (MULTI-SHEET)
 # ─────────────────────────────────────────────────────────
@@ -207,6 +233,8 @@ with pd.ExcelWriter(OUTPUT_EXCEL, engine="openpyxl") as writer:
     # ── Fact tables ──
     bat_season.to_excel(writer,     sheet_name="Fact_Batsman",     index=False)
     bowler_season.to_excel(writer,  sheet_name="Fact_Bowler",      index=False)
+    for sheet_name, df in stage_facts.items():
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
 
     # ── KPI tables ──
     for sheet_name, df in kpi_data.items():
@@ -223,6 +251,8 @@ print(f"  {'Dim_Venues':<22} {len(venue_table):>6}")
 print(f"  {'Season_Summary':<22} {len(season_summary):>6}")
 print(f"  {'Fact_Batsman':<22} {len(bat_season):>6,}")
 print(f"  {'Fact_Bowler':<22} {len(bowler_season):>6,}")
+for sn, df in stage_facts.items():
+    print(f"  {sn:<22} {len(df):>6,}")
 for sn, df in kpi_data.items():
     print(f"  {sn:<22} {len(df):>6,}")
 
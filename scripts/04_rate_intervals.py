@@ -0,0 +1,166 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - RATE METRIC INTERVALS MODULE
+  Script: 04_rate_intervals.py
+  Description: Bootstrap confidence intervals for every
+               player's strike rate (KPI 4), boundary % (KPI 5),
+               economy rate (KPI 6) and dot ball % (KPI 7).
+               Run after 02_kpi_engineering.py and before
+               03_export_powerbi.py.
+============================================================
+
+Method:
+  Each player's balls are reduced to counts per outcome category
+  (runs off the bat; runs conceded × legal/illegal delivery).
+  A bootstrap resample of n balls is then one multinomial draw
+  over those counts, so all players × all resamples are drawn as
+  a single (players × resamples × categories) array per chunk.
+  Every rate metric is a ratio of two linear combinations of the
+  category counts, evaluated with one matrix product.
+
+  Chunks of players are sharded across a process pool. Each chunk
+  gets its own child seed spawned from BOOTSTRAP_SEED, so results
+  are identical regardless of the number of workers.
+============================================================
+"""
+
+import pandas as pd
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+import warnings
+warnings.filterwarnings("ignore")
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
+KPI_DIR       = os.path.join(PROCESSED_DIR, "kpis")
+
+N_BOOTSTRAP    = 1000
+CONFIDENCE     = 0.95
+BOOTSTRAP_SEED = 2026
+CHUNK_SIZE     = 256                      # players per worker task
+N_WORKERS      = os.cpu_count() or 1
+
+
+# ─────────────────────────────────────────────────────────
+# 1. OUTCOME COUNT MATRICES
+# ─────────────────────────────────────────────────────────
+def outcome_matrix(frame, player_col, outcome_cols):
+    """Player × outcome-category count matrix.
+    Returns (players, counts, categories) where `categories` is a
+    DataFrame with one row per column of `counts`."""
+    grouped = frame.groupby([player_col] + outcome_cols).size().unstack(outcome_cols, fill_value=0)
+    categories = grouped.columns.to_frame(index=False)
+    return grouped.index.to_numpy(), grouped.to_numpy(dtype=np.int64), categories
+
+
+# ─────────────────────────────────────────────────────────
+# 2. VECTORIZED BOOTSTRAP (ONE CHUNK OF PLAYERS)
+# ─────────────────────────────────────────────────────────
+def ratio_metrics(counts, metrics):
+    """Evaluate scale × (counts · numerator) / (counts · denominator)
+    over the trailing category axis for every metric."""
+    out = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, (numerator, denominator, scale) in metrics.items():
+            out[name] = scale * (counts @ numerator) / (counts @ denominator)
+    return out
+
+
+def bootstrap_chunk(task):
+    """Percentile intervals for one chunk of players.
+    `task` = (counts, metrics, seed_seq, n_boot, confidence)."""
+    counts, metrics, seed_seq, n_boot, confidence = task
+    rng    = np.random.default_rng(seed_seq)
+    n      = counts.sum(axis=1)
+    pvals  = counts / n[:, None]
+
+    # players × resamples × categories
+    draws = rng.multinomial(n[:, None], pvals[:, None, :], size=(len(n), n_boot))
+    stats = ratio_metrics(draws.astype(float), metrics)
+
+    alpha = (1 - confidence) / 2
+    return {
+        name: np.nanpercentile(values, [100 * alpha, 100 * (1 - alpha)], axis=1).T
+        for name, values in stats.items()
+    }
+
+
+def bootstrap_intervals(players, counts, metrics, n_boot=N_BOOTSTRAP,
+                        confidence=CONFIDENCE, seed=BOOTSTRAP_SEED,
+                        chunk_size=CHUNK_SIZE, n_workers=N_WORKERS):
+    """Point estimates and percentile intervals for every player."""
+    starts = range(0, len(players), chunk_size)
+    seeds  = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks  = [(counts[s:s + chunk_size], metrics, seed_seq, n_boot, confidence)
+              for s, seed_seq in zip(starts, seeds)]
+
+    if n_workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(bootstrap_chunk, tasks))
+    else:
+        results = [bootstrap_chunk(task) for task in tasks]
+
+    table = pd.DataFrame({"player": players, "sample_size": counts.sum(axis=1)})
+    for name, point in ratio_metrics(counts.astype(float), metrics).items():
+        bounds = np.vstack([r[name] for r in results]) if results else np.empty((0, 2))
+        table[name]             = np.round(point, 2)
+        table[f"{name}_ci_low"]  = np.round(bounds[:, 0], 2)
+        table[f"{name}_ci_high"] = np.round(bounds[:, 1], 2)
+    return table
+
+
+# ─────────────────────────────────────────────────────────
+# 3. PIPELINE
+# ─────────────────────────────────────────────────────────
+def main():
+    print("=" * 60)
+    print("  Rate Metric Confidence Intervals (Bootstrap)")
+    print("=" * 60)
+
+    deliveries = pd.read_csv(os.path.join(PROCESSED_DIR, "deliveries_enriched.csv"))
+    bat_col    = "batter" if "batter" in deliveries.columns else "batsman"
+    print(f"  ✔  deliveries : {deliveries.shape[0]:,} rows")
+    print(f"  ✔  {N_BOOTSTRAP:,} resamples · {CONFIDENCE:.0%} CI · seed {BOOTSTRAP_SEED} "
+          f"· {N_WORKERS} worker(s)")
+
+    # ── Batting: balls faced exclude wides (KPI 4 / KPI 5) ──
+    print("\n  [1/2] Batting intervals (strike rate, boundary %)...")
+    non_wide = deliveries[deliveries["wide_runs"] == 0]
+    players, counts, cats = outcome_matrix(non_wide, bat_col, ["batsman_runs"])
+    runs  = cats["batsman_runs"].to_numpy(dtype=float)
+    ones  = np.ones(len(cats))
+    batting_metrics = {
+        "strike_rate"         : (runs,                                   ones, 100),
+        "boundary_percentage" : (np.isin(runs, [4, 6]).astype(float),    ones, 100),
+    }
+    batting = bootstrap_intervals(players, counts, batting_metrics)
+    batting.rename(columns={"player": "batsman", "sample_size": "balls_faced"}, inplace=True)
+    print(f"  ✔  {len(batting):,} batsmen")
+
+    # ── Bowling: all deliveries, legal balls exclude wides + no-balls (KPI 6 / KPI 7) ──
+    print("\n  [2/2] Bowling intervals (economy, dot ball %)...")
+    bowl = deliveries.assign(
+        legal=((deliveries["wide_runs"] == 0) & (deliveries["noball_runs"] == 0)).astype(int)
+    )
+    players, counts, cats = outcome_matrix(bowl, "bowler", ["total_runs", "legal"])
+    runs  = cats["total_runs"].to_numpy(dtype=float)
+    legal = cats["legal"].to_numpy(dtype=float)
+    bowling_metrics = {
+        "economy_rate"        : (runs,                         legal, 6),
+        "dot_ball_percentage" : (legal * (runs == 0),          legal, 100),
+    }
+    bowling = bootstrap_intervals(players, counts, bowling_metrics)
+    bowling.rename(columns={"player": "bowler", "sample_size": "deliveries"}, inplace=True)
+    print(f"  ✔  {len(bowling):,} bowlers")
+
+    batting.to_csv(os.path.join(KPI_DIR, "kpi_12_batting_intervals.csv"), index=False)
+    bowling.to_csv(os.path.join(KPI_DIR, "kpi_12_bowling_intervals.csv"), index=False)
+    print(f"\n  ✔  Saved → kpi_12_batting_intervals.csv, kpi_12_bowling_intervals.csv")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - LIVE BALL-BY-BALL INGESTION
+  Script: 05_live_ingest.py
+  Description: Consumes delivery events from a local feed
+               (tailed append-only file or a local TCP socket),
+               cleans each event with the same rules as
+               01_data_cleaning.py, updates running player /
+               team / match aggregates in O(1) per ball and
+               publishes KPI snapshots at a fixed interval.
+============================================================
+
+Feed formats (one delivery per line, deliveries.csv columns, plus an
+optional "seq" delivery id if the feed provides one):
+  *.jsonl / *.json  → one JSON object per line
+  *.csv             → header line, then one CSV row per line
+  --port N          → newline-delimited JSON sent to 127.0.0.1:N
+
+Output Files (rewritten atomically every --interval seconds):
+  data/processed/live/
+  ├── live_batting.csv
+  ├── live_bowling.csv
+  ├── live_teams.csv
+  └── live_matches.csv
+
+Usage:
+  python scripts/05_live_ingest.py --feed data/live/feed.jsonl --interval 0.5
+  python scripts/05_live_ingest.py --port 9099
+============================================================
+"""
+
+import pandas as pd
+import argparse
+import csv
+import json
+import os
+import socket
+import time
+from collections import defaultdict
+
+from cleaning_rules import clean_delivery, BOWLER_WICKETS
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+DATA_DIR      = os.path.join(os.path.dirname(__file__), "..", "data")
+LIVE_DIR      = os.path.join(DATA_DIR, "processed", "live")
+DEFAULT_FEED  = os.path.join(DATA_DIR, "live", "feed.jsonl")
+
+PUBLISH_INTERVAL = 1.0      # seconds between KPI snapshots
+POLL_INTERVAL    = 0.05     # seconds between feed polls when idle
+
+INT_COLS      = ["match_id", "inning", "over", "ball", "is_super_over"]
+REQUIRED_COLS = ["match_id", "inning", "over", "ball", "batting_team", "bowling_team", "bowler"]
+SEQUENCE_COL  = "seq"       # optional per-delivery id from the feed
+
+BOWLER_WICKET_SET = set(BOWLER_WICKETS)
+
+
+# ─────────────────────────────────────────────────────────
+# 1. FEEDS
+# ─────────────────────────────────────────────────────────
+# Both feeds yield one event per delivery (a dict for CSV rows, the raw
+# line for JSON, parsed later so one bad line can be rejected on its own)
+# and None whenever no complete event is available, so the caller can
+# publish on schedule.
+
+def tail_file(path, from_start=True, poll_interval=POLL_INTERVAL):
+    """Follow an append-only JSONL or CSV file."""
+    is_csv = path.lower().endswith(".csv")
+    header = None
+    buffer = ""
+    while not os.path.exists(path):
+        yield None
+        time.sleep(poll_interval)
+
+    with open(path, "r", encoding="utf-8") as fh:
+        if not from_start:
+            fh.seek(0, os.SEEK_END)
+            if is_csv:
+                with open(path, "r", encoding="utf-8") as head:
+                    header = next(csv.reader([head.readline()]))
+        while True:
+            chunk = fh.readline()
+            if not chunk:
+                yield None
+                time.sleep(poll_interval)
+                continue
+            buffer += chunk
+            if not buffer.endswith("\n"):       # partial write – wait for the rest
+                continue
+            line, buffer = buffer.strip(), ""
+            if not line:
+                continue
+            if not is_csv:
+                yield line
+            elif header is None:
+                header = next(csv.reader([line]))
+            else:
+                yield dict(zip(header, next(csv.reader([line]))))
+
+
+def socket_feed(port, host="127.0.0.1", poll_interval=POLL_INTERVAL):
+    """Listen on a local TCP socket for newline-delimited JSON events."""
+    server = socket.create_server((host, port))
+    server.settimeout(poll_interval)
+    conn, buffer = None, b""
+    try:
+        while True:
+            if conn is None:
+                try:
+                    conn, _ = server.accept()
+                    conn.settimeout(poll_interval)
+                except socket.timeout:
+                    yield None
+                    continue
+            try:
+                data = conn.recv(65536)
+            except socket.timeout:
+                yield None
+                continue
+            if not data:                        # client closed – wait for the next one
+                conn.close()
+                conn, buffer = None, b""
+                continue
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+    finally:
+        if conn is not None:
+            conn.close()
+        server.close()
+
+
+# ─────────────────────────────────────────────────────────
+# 2. RUNNING AGGREGATES (O(1) PER DELIVERY)
+# ─────────────────────────────────────────────────────────
+def _batting_counter():
+    return {"runs": 0, "balls_faced": 0, "fours": 0, "sixes": 0, "dismissals": 0}
+
+
+def _bowling_counter():
+    return {"runs_conceded": 0, "legal_balls": 0, "dot_balls": 0, "wickets": 0}
+
+
+def _team_counter():
+    return {"runs": 0, "legal_balls": 0, "wickets_lost": 0,
+            "runs_conceded": 0, "legal_balls_bowled": 0, "wickets_taken": 0}
+
+
+def _innings_counter():
+    return {"batting_team": None, "bowling_team": None,
+            "runs": 0, "wickets": 0, "legal_balls": 0, "extras": 0}
+
+
+class LiveAggregates:
+    """Running per-player, per-team and per-match (innings) counters.
+    Rules match the batch KPIs: balls faced exclude wides, legal
+    balls exclude wides and no-balls, bowler wickets use
+    BOWLER_WICKETS.
+
+    Duplicates are detected on the delivery key (match_id, inning,
+    over, ball), plus SEQUENCE_COL when the feed sends one. Without
+    it, wides / no-balls may share a ball number with the delivery
+    that follows, so a ball number is closed by its legal delivery:
+    any later event with that number is a duplicate (re-sent), while
+    extras before it are all counted."""
+
+    def __init__(self):
+        self.batting = defaultdict(_batting_counter)
+        self.bowling = defaultdict(_bowling_counter)
+        self.teams   = defaultdict(_team_counter)
+        self.innings = defaultdict(_innings_counter)     # (match_id, inning) → counters
+        self.balls_processed = 0
+        self.duplicates      = 0
+        self.rejected        = 0
+        self._seen = set()          # delivery keys already counted
+
+    def delivery_key(self, row):
+        key = (row["match_id"], row["inning"], row["over"], row["ball"])
+        seq = row.get(SEQUENCE_COL)
+        return key if seq in (None, "") else key + (seq,)
+
+    def update(self, row):
+        is_wide  = row["wide_runs"] > 0
+        is_legal = not is_wide and row["noball_runs"] == 0
+        key      = self.delivery_key(row)
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        if is_legal or len(key) > 4:
+            self._seen.add(key)
+
+        bat_name  = row.get("batter", row.get("batsman"))
+        is_out    = row["player_dismissed"] != "N/A"
+        bowler_wk = row["dismissal_kind"] in BOWLER_WICKET_SET
+        runs      = row["total_runs"]
+
+        bat = self.batting[bat_name]
+        bat["runs"] += row["batsman_runs"]
+        if not is_wide:
+            bat["balls_faced"] += 1
+            bat["fours"] += row["batsman_runs"] == 4
+            bat["sixes"] += row["batsman_runs"] == 6
+        if is_out:
+            self.batting[row["player_dismissed"]]["dismissals"] += 1
+
+        bowl = self.bowling[row["bowler"]]
+        bowl["runs_conceded"] += runs
+        bowl["legal_balls"]   += is_legal
+        bowl["dot_balls"]     += is_legal and runs == 0
+        bowl["wickets"]       += bowler_wk
+
+        batting_team = self.teams[row["batting_team"]]
+        batting_team["runs"]         += runs
+        batting_team["legal_balls"]  += is_legal
+        batting_team["wickets_lost"] += is_out
+
+        bowling_team = self.teams[row["bowling_team"]]
+        bowling_team["runs_conceded"]      += runs
+        bowling_team["legal_balls_bowled"] += is_legal
+        bowling_team["wickets_taken"]      += is_out
+
+        inn = self.innings[(row["match_id"], row["inning"])]
+        inn["batting_team"] = row["batting_team"]
+        inn["bowling_team"] = row["bowling_team"]
+        inn["runs"]        += runs
+        inn["wickets"]     += is_out
+        inn["legal_balls"] += is_legal
+        inn["extras"]      += row["extra_runs"]
+
+        self.balls_processed += 1
+        return True
+
+    def snapshot(self):
+        """KPI tables derived from the current counters."""
+        batting = pd.DataFrame.from_dict(self.batting, orient="index").rename_axis("batsman").reset_index()
+        if len(batting):
+            balls = batting["balls_faced"].where(batting["balls_faced"] > 0)
+            batting["strike_rate"]         = (batting["runs"] / balls * 100).round(2)
+            batting["boundary_percentage"] = ((batting["fours"] + batting["sixes"]) / balls * 100).round(2)
+
+        bowling = pd.DataFrame.from_dict(self.bowling, orient="index").rename_axis("bowler").reset_index()
+        if len(bowling):
+            legal = bowling["legal_balls"].where(bowling["legal_balls"] > 0)
+            bowling["overs_bowled"]        = (bowling["legal_balls"] / 6).round(2)
+            bowling["economy_rate"]        = (bowling["runs_conceded"] / legal * 6).round(2)
+            bowling["dot_ball_percentage"] = (bowling["dot_balls"] / legal * 100).round(2)
+
+        teams = pd.DataFrame.from_dict(self.teams, orient="index").rename_axis("team").reset_index()
+        if len(teams):
+            teams["run_rate"]     = (teams["runs"] / teams["legal_balls"].where(teams["legal_balls"] > 0) * 6).round(2)
+            teams["economy_rate"] = (teams["runs_conceded"]
+                                     / teams["legal_balls_bowled"].where(teams["legal_balls_bowled"] > 0) * 6).round(2)
+
+        matches = pd.DataFrame.from_dict(self.innings, orient="index")
+        if len(matches):
+            matches.index.names = ["match_id", "inning"]
+            matches = matches.reset_index()
+            matches["overs"]    = (matches["legal_balls"] // 6).astype(str) + "." + (matches["legal_balls"] % 6).astype(str)
+            matches["run_rate"] = (matches["runs"] / matches["legal_balls"].where(matches["legal_balls"] > 0) * 6).round(2)
+
+        return {"batting": batting, "bowling": bowling, "teams": teams, "matches": matches}
+
+
+# ─────────────────────────────────────────────────────────
+# 3. PUBLISH + MAIN LOOP
+# ─────────────────────────────────────────────────────────
+def publish(snapshot, out_dir=LIVE_DIR):
+    """Write each snapshot table to live_<name>.csv via temp file + rename,
+    so readers (Power BI refresh, API) never see a half-written file."""
+    os.makedirs(out_dir, exist_ok=True)
+    for name, df in snapshot.items():
+        target = os.path.join(out_dir, f"live_{name}.csv")
+        tmp    = target + ".tmp"
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, target)
+
+
+def prepare_event(event):
+    """Parse (if raw JSON) and clean one event. Raises ValueError for
+    malformed JSON, missing required columns or non-numeric counts."""
+    if isinstance(event, (str, bytes)):
+        event = json.loads(event)
+    if not isinstance(event, dict):
+        raise ValueError(f"expected a JSON object, got {type(event).__name__}")
+    missing = [c for c in REQUIRED_COLS if event.get(c) in (None, "")]
+    if event.get("batter", event.get("batsman")) in (None, ""):
+        missing.append("batsman")
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+
+    row = clean_delivery(event)
+    for col in INT_COLS:
+        if col in row and row[col] not in (None, ""):
+            row[col] = int(float(row[col]))
+    return row
+
+
+def run(feed, aggregates, interval=PUBLISH_INTERVAL, out_dir=LIVE_DIR, idle_timeout=0):
+    """Consume `feed` until it ends (or stays idle for `idle_timeout`
+    seconds, if > 0), publishing a snapshot every `interval` seconds."""
+    last_publish = last_event = time.monotonic()
+    published_at = -1
+    for event in feed:
+        now = time.monotonic()
+        if event is not None:
+            last_event = now
+            try:
+                aggregates.update(prepare_event(event))
+            except (ValueError, TypeError) as exc:       # bad event shouldn't stop the feed
+                aggregates.rejected += 1
+                print(f"  ⚠️  REJECTED event #{aggregates.rejected:,}: {exc}")
+        if now - last_publish >= interval and aggregates.balls_processed != published_at:
+            publish(aggregates.snapshot(), out_dir)
+            published_at, last_publish = aggregates.balls_processed, now
+            print(f"  ✔  Snapshot published → {aggregates.balls_processed:,} balls "
+                  f"({aggregates.duplicates:,} duplicates skipped, "
+                  f"{aggregates.rejected:,} rejected)")
+        if idle_timeout and now - last_event >= idle_timeout:
+            break
+    publish(aggregates.snapshot(), out_dir)
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live ball-by-ball KPI ingestion")
+    parser.add_argument("--feed", default=DEFAULT_FEED, help="append-only .jsonl / .csv feed to tail")
+    parser.add_argument("--port", type=int, help="listen on 127.0.0.1:PORT instead of tailing a file")
+    parser.add_argument("--interval", type=float, default=PUBLISH_INTERVAL, help="seconds between snapshots")
+    parser.add_argument("--from-end", action="store_true", help="skip events already in the feed file")
+    parser.add_argument("--idle-timeout", type=float, default=0, help="stop after N idle seconds (0 = never)")
+    parser.add_argument("--out", default=LIVE_DIR, help="snapshot output directory")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  IPL Analytics — Live Ingestion")
+    print("=" * 60)
+    if args.port:
+        print(f"  📡  Listening on 127.0.0.1:{args.port}")
+        feed = socket_feed(args.port)
+    else:
+        print(f"  📄  Tailing {args.feed}")
+        feed = tail_file(args.feed, from_start=not args.from_end)
+    print(f"  ⏱   Publishing every {args.interval}s → {args.out}")
+
+    try:
+        aggregates = run(feed, LiveAggregates(), args.interval, args.out, args.idle_timeout)
+    except KeyboardInterrupt:
+        print("\n  ⏹   Stopped.")
+        return
+    print(f"\n  ✔  Feed idle — {aggregates.balls_processed:,} balls processed, "
+          f"{aggregates.duplicates:,} duplicates skipped, {aggregates.rejected:,} events rejected")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - RATING ENGINE
+  Script: 06_ratings.py
+  Description: Elo ratings for teams (match results) and for
+               batsmen / bowlers (ball-by-ball duels), processed
+               in date order with a snapshot saved at the end of
+               every season. Re-runs only apply matches not yet
+               rated, starting from the latest snapshot that
+               precedes them. Run after 01_data_cleaning.py and
+               before 03_export_powerbi.py.
+============================================================
+
+Rating rules:
+  Team   : standard Elo, E = 1 / (1 + 10^((R_opp − R) / 400)),
+           R += TEAM_K × (result − E). No-result matches are skipped.
+  Duel   : every non-wide ball is a batsman-vs-bowler contest with
+           score s = batsman_runs / 6 (0 on a bowler's wicket).
+           E = sigmoid(logit(s̄) + (R_bat − R_bowl) × ln10 / 400),
+           where s̄ is the league mean ball score frozen at the
+           first build, so two equal players expect s̄, not 0.5.
+           s̄ is kept in duel_baseline.json and reused by --rebuild,
+           so a rebuild reproduces incremental runs; --rebaseline
+           recomputes it from the current deliveries and replays
+           all history (every player rating shifts).
+           R_bat += DUEL_K × (s − E), R_bowl −= DUEL_K × (s − E).
+
+Output Files:
+  data/processed/ratings/
+  ├── duel_baseline.json               ← frozen league mean ball score s̄
+  ├── snapshots/ratings_<season>.pkl   ← state at end of each season
+  ├── team_rating_history.csv          ← pre/post rating per team-match
+  ├── fact_team_ratings.csv            ← team × season (Power BI)
+  └── fact_player_ratings.csv          ← player × role × season (Power BI)
+============================================================
+"""
+
+import pandas as pd
+import argparse
+import json
+import math
+import os
+import pickle
+from collections import Counter
+
+from cleaning_rules import BOWLER_WICKETS
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
+RATINGS_DIR   = os.path.join(PROCESSED_DIR, "ratings")
+SNAPSHOT_DIR  = os.path.join(RATINGS_DIR, "snapshots")
+HISTORY_FILE  = os.path.join(RATINGS_DIR, "team_rating_history.csv")
+BASELINE_FILE = os.path.join(RATINGS_DIR, "duel_baseline.json")
+
+INITIAL_RATING = 1500.0
+TEAM_K         = 24.0
+DUEL_K         = 4.0
+
+
+# ─────────────────────────────────────────────────────────
+# 1. RATING STATE + SNAPSHOTS
+# ─────────────────────────────────────────────────────────
+def new_state(baseline):
+    return {
+        "season"    : None,
+        "last_key"  : None,            # (date, match_id) of the last applied match
+        "processed" : set(),
+        "baseline"  : baseline,        # league mean ball score s̄
+        "team"      : {},
+        "batsman"   : {},
+        "bowler"    : {},
+        "season_matches" : Counter(),  # team → matches rated this season
+        "season_balls"   : Counter(),  # (role, player) → balls rated this season
+    }
+
+
+def _snapshot_path(season):
+    return os.path.join(SNAPSHOT_DIR, f"ratings_{season}.pkl")
+
+
+def save_snapshot(state):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp = _snapshot_path(state["season"]) + ".tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump(state, fh)
+    os.replace(tmp, _snapshot_path(state["season"]))
+
+
+def load_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return {}
+    snaps = {}
+    for f in os.listdir(SNAPSHOT_DIR):
+        if f.startswith("ratings_") and f.endswith(".pkl"):
+            with open(os.path.join(SNAPSHOT_DIR, f), "rb") as fh:
+                state = pickle.load(fh)
+            snaps[state["season"]] = state
+    return dict(sorted(snaps.items()))
+
+
+def load_baseline(deliveries, snapshots, recompute=False):
+    """League mean ball score s̄: read from BASELINE_FILE (or adopted from
+    existing snapshots), else computed from `deliveries` and stored."""
+    if os.path.exists(BASELINE_FILE) and not recompute:
+        with open(BASELINE_FILE, "r", encoding="utf-8") as fh:
+            return json.load(fh)["baseline"]
+    if snapshots and not recompute:           # snapshots written before BASELINE_FILE existed
+        baseline, n_balls = next(iter(snapshots.values()))["baseline"], None
+    else:
+        _, score = ball_scores(deliveries)
+        baseline, n_balls = float(score.mean()), int(len(score))
+    os.makedirs(RATINGS_DIR, exist_ok=True)
+    with open(BASELINE_FILE, "w", encoding="utf-8") as fh:
+        json.dump({"baseline": baseline, "deliveries": n_balls}, fh, indent=2)
+    return baseline
+
+
+def choose_base(snapshots, match_keys, baseline):
+    """Latest snapshot that precedes every not-yet-rated match, or None.
+    Snapshots rated against a different baseline are never reused."""
+    snapshots = {season: state for season, state in snapshots.items()
+                 if state["baseline"] == baseline}
+    if not snapshots:
+        return None
+    processed = list(snapshots.values())[-1]["processed"]
+    pending   = [key for key in match_keys if key[1] not in processed]
+    if not pending:
+        return list(snapshots.values())[-1]
+    earliest = min(pending)
+    for state in reversed(list(snapshots.values())):
+        if state["last_key"] < earliest:
+            return state
+    return None
+
+
+# ─────────────────────────────────────────────────────────
+# 2. UPDATES
+# ─────────────────────────────────────────────────────────
+def update_team(state, team1, team2, winner):
+    r1 = state["team"].get(team1, INITIAL_RATING)
+    r2 = state["team"].get(team2, INITIAL_RATING)
+    e1 = 1 / (1 + 10 ** ((r2 - r1) / 400))
+    s1 = 1.0 if winner == team1 else 0.0
+    state["team"][team1] = r1 + TEAM_K * (s1 - e1)
+    state["team"][team2] = r2 - TEAM_K * (s1 - e1)
+    state["season_matches"][team1] += 1
+    state["season_matches"][team2] += 1
+    return r1, r2, e1
+
+
+def update_duels(state, batsmen, bowlers, scores):
+    bat, bowl = state["batsman"], state["bowler"]
+    base_logit = math.log(state["baseline"] / (1 - state["baseline"]))
+    scale = math.log(10) / 400
+    balls = state["season_balls"]
+    for batsman, bowler, s in zip(batsmen, bowlers, scores):
+        rb = bat.get(batsman, INITIAL_RATING)
+        rw = bowl.get(bowler, INITIAL_RATING)
+        e  = 1 / (1 + math.exp(-(base_logit + (rb - rw) * scale)))
+        delta = DUEL_K * (s - e)
+        bat[batsman] = rb + delta
+        bowl[bowler] = rw - delta
+        balls[("batsman", batsman)] += 1
+        balls[("bowler", bowler)]   += 1
+
+
+def ball_scores(deliveries):
+    """Duel score per non-wide ball: runs off the bat / 6, 0 on a bowler's wicket."""
+    faced = deliveries[deliveries["wide_runs"] == 0]
+    score = faced["batsman_runs"].clip(0, 6) / 6
+    score = score.where(~faced["dismissal_kind"].isin(BOWLER_WICKETS), 0.0)
+    return faced, score
+
+
+def apply_matches(state, matches, deliveries):
+    """Apply matches (sorted by date, match_id) on top of `state`, saving a
+    snapshot each time a season ends. Returns team-match history rows."""
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+    faced, score = ball_scores(deliveries)
+    faced = faced.assign(score=score.to_numpy())
+    by_match = faced.groupby("match_id").indices
+    bat_arr, bowl_arr, score_arr = (faced[bat_col].to_numpy(), faced["bowler"].to_numpy(),
+                                    faced["score"].to_numpy())
+    history = []
+
+    for m in matches.itertuples(index=False):
+        if state["season"] is not None and m.season != state["season"]:
+            save_snapshot(state)
+            state["season_matches"], state["season_balls"] = Counter(), Counter()
+        state["season"] = m.season
+
+        if m.winner != "No Result":
+            r1, r2, e1 = update_team(state, m.team1, m.team2, m.winner)
+            for team, opp, pre, exp in [(m.team1, m.team2, r1, e1), (m.team2, m.team1, r2, 1 - e1)]:
+                history.append({"match_id": m.match_id, "date": m.date, "season": m.season,
+                                "team": team, "opponent": opp, "won": int(m.winner == team),
+                                "expected_win": round(exp, 4), "pre_rating": round(pre, 1),
+                                "post_rating": round(state["team"][team], 1)})
+
+        idx = by_match.get(m.match_id)
+        if idx is not None:
+            update_duels(state, bat_arr[idx], bowl_arr[idx], score_arr[idx])
+
+        state["last_key"] = (m.date, m.match_id)
+        state["processed"].add(m.match_id)
+
+    if state["season"] is not None:
+        save_snapshot(state)
+    return history
+
+
+# ─────────────────────────────────────────────────────────
+# 3. FACT TABLES
+# ─────────────────────────────────────────────────────────
+def build_fact_tables(snapshots):
+    team_rows, player_rows = [], []
+    for season, state in snapshots.items():
+        for team, rating in state["team"].items():
+            matches = state["season_matches"].get(team, 0)
+            if matches:                     # defunct / absent teams get no row
+                team_rows.append({"team": team, "season": season, "rating": round(rating, 1),
+                                  "matches": matches})
+        for role in ("batsman", "bowler"):
+            for player, rating in state[role].items():
+                balls = state["season_balls"].get((role, player), 0)
+                if balls:
+                    player_rows.append({"player": player, "role": role, "season": season,
+                                        "rating": round(rating, 1), "balls": balls})
+
+    fact_team = pd.DataFrame(team_rows, columns=["team", "season", "rating", "matches"])
+    fact_team = fact_team.sort_values(["team", "season"])
+    fact_team["rating_change"] = fact_team.groupby("team")["rating"].diff().round(1)
+    fact_player = pd.DataFrame(player_rows, columns=["player", "role", "season", "rating", "balls"])
+    return fact_team.reset_index(drop=True), fact_player.sort_values(["role", "player", "season"])
+
+
+# ─────────────────────────────────────────────────────────
+# 4. MAIN
+# ─────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Incremental team / player Elo ratings")
+    parser.add_argument("--rebuild", action="store_true", help="ignore snapshots and replay all history")
+    parser.add_argument("--rebaseline", action="store_true",
+                        help="recompute the duel baseline from current deliveries (implies --rebuild)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  IPL Analytics — Rating Engine")
+    print("=" * 60)
+
+    matches    = pd.read_csv(os.path.join(PROCESSED_DIR, "matches_cleaned.csv"))
+    deliveries = pd.read_csv(os.path.join(PROCESSED_DIR, "deliveries_cleaned.csv"))
+    matches["date"] = pd.to_datetime(matches["date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    matches = matches.dropna(subset=["date"]).sort_values(["date", "match_id"]).reset_index(drop=True)
+    keys = list(zip(matches["date"], matches["match_id"]))
+
+    snapshots = load_snapshots()
+    baseline  = load_baseline(deliveries, snapshots, recompute=args.rebaseline)
+    print(f"  ✔  Duel baseline s̄ = {baseline:.4f}")
+    base = None if args.rebuild or args.rebaseline else choose_base(snapshots, keys, baseline)
+    if base is None:
+        state = new_state(baseline)
+        print("  ✔  No usable snapshot → replaying full history")
+        for season in list(snapshots):
+            os.remove(_snapshot_path(season))
+        snapshots = {}
+    else:
+        state = pickle.loads(pickle.dumps(base))
+        print(f"  ✔  Resuming from season {state['season']} snapshot "
+              f"(last match {state['last_key'][0]})")
+        for season in [s for s in snapshots if s > state["season"]]:
+            os.remove(_snapshot_path(season))
+
+    todo = matches[[key > state["last_key"] for key in keys]] if state["last_key"] else matches
+    todo_deliveries = deliveries[deliveries["match_id"].isin(todo["match_id"])]
+    print(f"  ✔  Applying {len(todo):,} matches / {len(todo_deliveries):,} deliveries")
+
+    history = pd.DataFrame(apply_matches(state, todo, todo_deliveries))
+    if os.path.exists(HISTORY_FILE) and base is not None:
+        previous = pd.read_csv(HISTORY_FILE)
+        previous = previous[previous["match_id"].isin(base["processed"])]
+        history  = pd.concat([previous, history], ignore_index=True)
+    history.to_csv(HISTORY_FILE, index=False)
+
+    fact_team, fact_player = build_fact_tables(load_snapshots())
+    fact_team.to_csv(os.path.join(RATINGS_DIR, "fact_team_ratings.csv"), index=False)
+    fact_player.to_csv(os.path.join(RATINGS_DIR, "fact_player_ratings.csv"), index=False)
+
+    latest = fact_team[fact_team["season"] == fact_team["season"].max()].sort_values("rating", ascending=False)
+    print("\n  Current Team Ratings:")
+    print(latest[["team", "rating", "matches"]].to_string(index=False))
+    print(f"\n  ✔  Saved → ratings/fact_team_ratings.csv ({len(fact_team):,} rows)")
+    print(f"  ✔  Saved → ratings/fact_player_ratings.csv ({len(fact_player):,} rows)")
+    print(f"  ✔  Saved → ratings/team_rating_history.csv ({len(history):,} rows)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
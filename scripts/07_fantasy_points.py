@@ -0,0 +1,272 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - FANTASY POINTS ENGINE
+  Script: 07_fantasy_points.py
+  Description: Fantasy points for every player in every match
+               (batting, bowling, fielding and bonus rules) from
+               the cleaned deliveries / matches, computed in one
+               grouped pass per run. Only matches not already in
+               the fact table are scored and appended. Run after
+               01_data_cleaning.py and before 03_export_powerbi.py.
+============================================================
+
+Ruleset:
+  FANTASY_RULES below (T20 defaults). Override any key with
+  --rules my_rules.json; changing the ruleset re-scores every
+  match (the fact table stores the ruleset hash per row).
+
+Output Files:
+  data/processed/fantasy/
+  └── fact_fantasy_points.csv   ← match_id × player (Power BI)
+============================================================
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import hashlib
+import json
+import os
+
+from cleaning_rules import BOWLER_WICKETS
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
+FANTASY_DIR   = os.path.join(PROCESSED_DIR, "fantasy")
+FACT_FILE     = os.path.join(FANTASY_DIR, "fact_fantasy_points.csv")
+
+# Bands are (lower inclusive, upper exclusive, points)
+FANTASY_RULES = {
+    "appearance"         : 4,
+    # batting
+    "run"                : 1,
+    "four_bonus"         : 1,
+    "six_bonus"          : 2,
+    "milestones"         : [[30, 4], [50, 8], [100, 16]],
+    "stack_milestones"   : False,       # False → only the highest milestone reached
+    "duck"               : -2,
+    "strike_rate_min_balls" : 10,
+    "strike_rate_bands"  : [[170, 1e9, 6], [150, 170, 4], [130, 150, 2],
+                            [60, 70, -2], [50, 60, -4], [0, 50, -6]],
+    # bowling
+    "wicket"             : 25,          # bowler wickets only (not run outs)
+    "lbw_bowled_bonus"   : 8,
+    "wicket_hauls"       : [[3, 4], [4, 8], [5, 16]],
+    "stack_wicket_hauls" : False,
+    "dot_ball"           : 1,
+    "maiden"             : 12,
+    "economy_min_overs"  : 2,
+    "economy_bands"      : [[0, 5, 6], [5, 6, 4], [6, 7, 2],
+                            [10, 11, -2], [11, 12, -4], [12, 1e9, -6]],
+    # fielding
+    "catch"              : 8,
+    "three_catch_bonus"  : 4,
+    "stumping"           : 12,
+    "run_out"            : 6,
+}
+
+POINT_COLUMNS = ["batting_points", "bowling_points", "fielding_points", "appearance_points"]
+
+
+def rules_hash(rules):
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:10]
+
+
+# ─────────────────────────────────────────────────────────
+# 1. PLAYER-MATCH STAT LINES (ONE GROUPED PASS PER ROLE)
+# ─────────────────────────────────────────────────────────
+def player_match_stats(deliveries):
+    """One row per (match_id, player) with every count the rules need."""
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+    d = deliveries
+    keys = ["match_id"]
+
+    # everyone who took the field while batting, including non-strikers
+    # who never faced a ball (e.g. run out backing up)
+    appeared = pd.concat([
+        d[keys + [col, "batting_team"]].set_axis(keys + ["player", "team"], axis=1)
+        for col in (bat_col, "non_striker", "player_dismissed")
+    ])
+    appeared = appeared[appeared["player"].notna() & (appeared["player"] != "N/A")].drop_duplicates()
+
+    batting = d.assign(
+        faced = (d["wide_runs"] == 0).astype(int),
+        four  = (d["batsman_runs"] == 4).astype(int),
+        six   = (d["batsman_runs"] == 6).astype(int),
+    ).groupby(keys + [bat_col, "batting_team"]).agg(
+        runs=("batsman_runs", "sum"), balls_faced=("faced", "sum"),
+        fours=("four", "sum"), sixes=("six", "sum"),
+    ).reset_index().rename(columns={bat_col: "player", "batting_team": "team"})
+
+    is_legal = (d["wide_runs"] == 0) & (d["noball_runs"] == 0)
+    # runs charged to the bowler (maidens, economy): everything except byes / leg-byes
+    bowler_runs = d["batsman_runs"] + d["wide_runs"] + d["noball_runs"]
+    per_ball = d.assign(
+        legal      = is_legal.astype(int),
+        dot        = (is_legal & (d["total_runs"] == 0)).astype(int),
+        wicket     = d["dismissal_kind"].isin(BOWLER_WICKETS).astype(int),
+        lbw_bowled = d["dismissal_kind"].isin(["lbw", "bowled"]).astype(int),
+        charged    = bowler_runs,
+    )
+    overs = per_ball.groupby(keys + ["inning", "over", "bowler"]).agg(
+        legal=("legal", "sum"), charged=("charged", "sum"))
+    overs["maiden"] = ((overs["legal"] == 6) & (overs["charged"] == 0)).astype(int)
+    maidens = overs.groupby(keys + ["bowler"])["maiden"].sum()
+
+    bowling = per_ball.groupby(keys + ["bowler", "bowling_team"]).agg(
+        legal_balls=("legal", "sum"), runs_conceded=("charged", "sum"),
+        dots=("dot", "sum"), wickets=("wicket", "sum"), lbw_bowled=("lbw_bowled", "sum"),
+    ).reset_index()
+    bowling["maidens"] = maidens.reindex(pd.MultiIndex.from_frame(bowling[keys + ["bowler"]])).to_numpy()
+    bowling = bowling.rename(columns={"bowler": "player", "bowling_team": "team"})
+
+    # catches go to the fielder, or to the bowler for caught and bowled
+    kind = d["dismissal_kind"]
+    catcher = np.where(kind == "caught and bowled", d["bowler"], d["fielder"])
+    fielding = d.assign(
+        player   = catcher,
+        catch    = kind.isin(["caught", "caught and bowled"]).astype(int),
+        stumping = (kind == "stumped").astype(int),
+        run_out  = (kind == "run out").astype(int),
+    )
+    fielding = fielding[(fielding[["catch", "stumping", "run_out"]].sum(axis=1) > 0)
+                        & ~fielding["player"].isin(["N/A"]) & fielding["player"].notna()]
+    fielding = fielding.groupby(keys + ["player", "bowling_team"]).agg(
+        catches=("catch", "sum"), stumpings=("stumping", "sum"), run_outs=("run_out", "sum"),
+    ).reset_index().rename(columns={"bowling_team": "team"})
+
+    dismissed = d[d["player_dismissed"].notna() & (d["player_dismissed"] != "N/A")] \
+        .groupby(keys + ["player_dismissed"]).size().rename("dismissed").reset_index() \
+        .rename(columns={"player_dismissed": "player"})
+
+    stats = appeared.merge(batting, on=keys + ["player", "team"], how="outer") \
+                    .merge(bowling, on=keys + ["player", "team"], how="outer") \
+                    .merge(fielding, on=keys + ["player", "team"], how="outer")
+    stats = stats.merge(dismissed, on=keys + ["player"], how="left")
+    count_cols = [c for c in stats.columns if c not in keys + ["player", "team"]]
+    stats[count_cols] = stats[count_cols].fillna(0).astype(int)
+    return stats
+
+
+# ─────────────────────────────────────────────────────────
+# 2. VECTORIZED SCORING
+# ─────────────────────────────────────────────────────────
+def _threshold_points(values, thresholds, stack):
+    """Milestone / haul bonuses: every threshold reached, or only the highest."""
+    points = np.zeros(len(values))
+    for threshold, pts in sorted(thresholds):
+        reached = values >= threshold
+        points = points + pts * reached if stack else np.where(reached, pts, points)
+    return points
+
+
+def _band_points(values, bands, eligible):
+    conditions = [eligible & (values >= lo) & (values < hi) for lo, hi, _ in bands]
+    return np.select(conditions, [pts for _, _, pts in bands], 0)
+
+
+def score_stats(stats, rules):
+    s = stats
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strike_rate = np.where(s["balls_faced"] > 0, s["runs"] / s["balls_faced"] * 100, 0.0)
+        economy     = np.where(s["legal_balls"] > 0, s["runs_conceded"] / s["legal_balls"] * 6, 0.0)
+
+    batting = (
+        rules["run"] * s["runs"]
+        + rules["four_bonus"] * s["fours"]
+        + rules["six_bonus"] * s["sixes"]
+        + _threshold_points(s["runs"], rules["milestones"], rules["stack_milestones"])
+        + rules["duck"] * ((s["dismissed"] > 0) & (s["runs"] == 0))
+        + _band_points(strike_rate, rules["strike_rate_bands"],
+                       s["balls_faced"] >= rules["strike_rate_min_balls"])
+    )
+    bowling = (
+        rules["wicket"] * s["wickets"]
+        + rules["lbw_bowled_bonus"] * s["lbw_bowled"]
+        + _threshold_points(s["wickets"], rules["wicket_hauls"], rules["stack_wicket_hauls"])
+        + rules["dot_ball"] * s["dots"]
+        + rules["maiden"] * s["maidens"]
+        + _band_points(economy, rules["economy_bands"],
+                       s["legal_balls"] >= rules["economy_min_overs"] * 6)
+    )
+    fielding = (
+        rules["catch"] * s["catches"]
+        + rules["three_catch_bonus"] * (s["catches"] >= 3)
+        + rules["stumping"] * s["stumpings"]
+        + rules["run_out"] * s["run_outs"]
+    )
+
+    scored = s.copy()
+    scored["batting_points"]    = np.asarray(batting, dtype=float)
+    scored["bowling_points"]    = np.asarray(bowling, dtype=float)
+    scored["fielding_points"]   = np.asarray(fielding, dtype=float)
+    scored["appearance_points"] = float(rules["appearance"])
+    scored["total_points"]      = scored[POINT_COLUMNS].sum(axis=1)
+    return scored
+
+
+def fantasy_points(deliveries, matches, rules):
+    """Fact rows for every (match_id, player) in `deliveries`."""
+    scored = score_stats(player_match_stats(deliveries), rules)
+    scored = scored.merge(matches[["match_id", "season", "date", "venue"]], on="match_id", how="left")
+    scored["rules_hash"] = rules_hash(rules)
+    front = ["match_id", "season", "date", "venue", "player", "team", "total_points"] + POINT_COLUMNS
+    return scored[front + [c for c in scored.columns if c not in front]] \
+        .sort_values(["match_id", "total_points"], ascending=[True, False])
+
+
+# ─────────────────────────────────────────────────────────
+# 3. MAIN (INCREMENTAL)
+# ─────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Batch fantasy points per player-match")
+    parser.add_argument("--rules", help="JSON file overriding FANTASY_RULES keys")
+    parser.add_argument("--rebuild", action="store_true", help="re-score every match")
+    args = parser.parse_args()
+
+    rules = dict(FANTASY_RULES)
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as fh:
+            rules.update(json.load(fh))
+    current_hash = rules_hash(rules)
+
+    print("=" * 60)
+    print("  IPL Analytics — Fantasy Points Engine")
+    print("=" * 60)
+    print(f"  ✔  Ruleset hash: {current_hash}")
+
+    matches    = pd.read_csv(os.path.join(PROCESSED_DIR, "matches_cleaned.csv"))
+    deliveries = pd.read_csv(os.path.join(PROCESSED_DIR, "deliveries_cleaned.csv"))
+
+    done_ids = set()
+    if os.path.exists(FACT_FILE) and not args.rebuild:
+        # str dtype: an all-digit hex hash would otherwise be read back as an int
+        existing = pd.read_csv(FACT_FILE, usecols=["match_id", "rules_hash"], dtype={"rules_hash": str})
+        if (existing["rules_hash"] == current_hash).all():
+            done_ids = set(existing["match_id"])
+        else:
+            print("  ⚠️  Ruleset changed → re-scoring all matches")
+    if not done_ids and os.path.exists(FACT_FILE):
+        os.remove(FACT_FILE)
+
+    new_deliveries = deliveries[~deliveries["match_id"].isin(done_ids)]
+    print(f"  ✔  {len(done_ids):,} matches already scored → "
+          f"{new_deliveries['match_id'].nunique():,} new matches")
+
+    if len(new_deliveries):
+        facts = fantasy_points(new_deliveries, matches, rules)
+        os.makedirs(FANTASY_DIR, exist_ok=True)
+        facts.to_csv(FACT_FILE, mode="a", index=False, header=not os.path.exists(FACT_FILE))
+        print(f"  ✔  Appended {len(facts):,} player-match rows")
+        print("\n  Top 10 Player-Match Scores (this run):")
+        print(facts.nlargest(10, "total_points")[
+            ["match_id", "player", "team", "total_points"] + POINT_COLUMNS[:3]].to_string(index=False))
+
+    print(f"\n  ✔  Saved → fantasy/fact_fantasy_points.csv")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - SHARED CLEANING RULES
+  Module: cleaning_rules.py
+  Description: Team name map, missing-value defaults and
+               dismissal classification shared by the batch
+               cleaner (01_data_cleaning.py) and the live /
+               ingestion stages, so every path cleans data
+               the same way.
+============================================================
+"""
+
+TEAM_NAME_MAP = {
+    # Franchise renames / historical variants
+    "Delhi Daredevils"               : "Delhi Capitals",
+    "Deccan Chargers"                : "Sunrisers Hyderabad",
+    "Rising Pune Supergiants"        : "Rising Pune Supergiant",
+    "Kings XI Punjab"                : "Punjab Kings",
+    "Pune Warriors"                  : "Pune Warriors India",
+    "Kochi Tuskers Kerala"           : "Kochi Tuskers Kerala",
+    # Typo corrections
+    "Royal Challengers Bangaloru"    : "Royal Challengers Bangalore",
+}
+
+TEAM_COLS_MATCHES    = ["team1", "team2", "toss_winner", "winner"]
+TEAM_COLS_DELIVERIES = ["batting_team", "bowling_team"]
+
+# Numeric fill – runs / wicket extras
+FILL_ZERO_COLS = [
+    "wide_runs", "bye_runs", "legbye_runs", "noball_runs",
+    "penalty_runs", "batsman_runs", "extra_runs", "total_runs"
+]
+
+# Dismissal type is NaN when batter is not out – valid, leave as is but document
+DELIVERY_FILL_VALUES = {
+    "dismissal_kind"   : "not out",
+    "player_dismissed" : "N/A",
+    "fielder"          : "N/A",
+}
+
+# Valid dismissal kinds (not run out which is fielder's credit)
+BOWLER_WICKETS = [
+    "caught", "bowled", "lbw", "stumped",
+    "caught and bowled", "hit wicket"
+]
+
+
+def _is_missing(value):
+    return value is None or value == "" or value != value   # NaN != NaN
+
+
+def clean_delivery(event):
+    """Apply the deliveries cleaning rules to a single delivery dict
+    (one row of deliveries.csv). Returns a new dict."""
+    row = dict(event)
+    for col in TEAM_COLS_DELIVERIES:
+        if col in row:
+            row[col] = TEAM_NAME_MAP.get(row[col], row[col])
+    for col in FILL_ZERO_COLS:
+        row[col] = 0 if _is_missing(row.get(col)) else int(float(row[col]))
+    for col, default in DELIVERY_FILL_VALUES.items():
+        if _is_missing(row.get(col)):
+            row[col] = default
+    return row
@@ -0,0 +1,217 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - LEADERBOARD MODULE
+  Module: leaderboards.py
+  Description: Ranked per-metric indexes over player KPIs,
+               scoped overall, per season and per team, with
+               qualification thresholds and k chosen at query
+               time. Used by 02_kpi_engineering.py and by any
+               dashboard/API code that serves leaderboards.
+============================================================
+
+Usage:
+  from leaderboards import LeaderboardIndex
+  board = LeaderboardIndex(deliveries)
+  board.top_k("strike_rate", k=20, min_qualifier=100, season=2016)
+============================================================
+"""
+
+import pandas as pd
+import numpy as np
+
+from cleaning_rules import BOWLER_WICKETS
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+TOP_K            = 10
+MIN_BALLS_FACED  = 200    # strike rate / boundary % qualification
+MIN_OVERS_BOWLED = 10     # economy qualification
+MIN_LEGAL_BALLS  = 60     # dot ball % qualification
+
+# metric → role table, qualifier column, sort direction and the
+# thresholds whose top-k lists are precomputed when the index is built
+LEADERBOARD_METRICS = {
+    "runs"                : {"role": "batsman", "qualifier": "balls_faced",  "ascending": False,
+                             "thresholds": (0,)},
+    "strike_rate"         : {"role": "batsman", "qualifier": "balls_faced",  "ascending": False,
+                             "thresholds": (0, 100, MIN_BALLS_FACED)},
+    "boundary_percentage" : {"role": "batsman", "qualifier": "balls_faced",  "ascending": False,
+                             "thresholds": (0, 100, MIN_BALLS_FACED)},
+    "wickets"             : {"role": "bowler",  "qualifier": "overs_bowled", "ascending": False,
+                             "thresholds": (0,)},
+    "economy_rate"        : {"role": "bowler",  "qualifier": "overs_bowled", "ascending": True,
+                             "thresholds": (5, MIN_OVERS_BOWLED)},
+    "dot_ball_percentage" : {"role": "bowler",  "qualifier": "legal_balls",  "ascending": False,
+                             "thresholds": (30, MIN_LEGAL_BALLS)},
+}
+
+
+# ─────────────────────────────────────────────────────────
+# 1. ADDITIVE COUNT TABLES
+# ─────────────────────────────────────────────────────────
+def build_player_counts(deliveries):
+    """Aggregate deliveries into additive batting / bowling counts
+    at player × season × team grain. Rates are derived per scope."""
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+
+    # Balls faced exclude wides (same rule as KPI 4 / KPI 5)
+    non_wide = deliveries[deliveries["wide_runs"] == 0]
+    batting = non_wide.assign(
+        fours = (non_wide["batsman_runs"] == 4).astype(int),
+        sixes = (non_wide["batsman_runs"] == 6).astype(int),
+    ).groupby([bat_col, "season", "batting_team"]).agg(
+        runs        = ("batsman_runs", "sum"),
+        balls_faced = ("ball",         "count"),
+        fours       = ("fours",        "sum"),
+        sixes       = ("sixes",        "sum"),
+    ).reset_index()
+    batting.columns = ["player", "season", "team"] + list(batting.columns[3:])
+
+    # Legal deliveries exclude wides and no-balls (same rule as KPI 6 / KPI 7)
+    is_legal = (deliveries["wide_runs"] == 0) & (deliveries["noball_runs"] == 0)
+    bowling = deliveries.assign(
+        legal_ball = is_legal.astype(int),
+        dot_ball   = (is_legal & (deliveries["total_runs"] == 0)).astype(int),
+        wicket     = deliveries["dismissal_kind"].isin(BOWLER_WICKETS).astype(int),
+    ).groupby(["bowler", "season", "bowling_team"]).agg(
+        runs_conceded = ("total_runs", "sum"),
+        legal_balls   = ("legal_ball", "sum"),
+        dot_balls     = ("dot_ball",   "sum"),
+        wickets       = ("wicket",     "sum"),
+    ).reset_index()
+    bowling.columns = ["player", "season", "team"] + list(bowling.columns[3:])
+
+    return batting, bowling
+
+
+def add_rate_columns(batting=None, bowling=None):
+    """Derive rate metrics from summed counts (in place)."""
+    if batting is not None:
+        balls = batting["balls_faced"].replace(0, np.nan)
+        batting["strike_rate"]         = (batting["runs"] / balls * 100).round(2)
+        batting["boundary_percentage"] = ((batting["fours"] + batting["sixes"]) / balls * 100).round(2)
+    if bowling is not None:
+        legal = bowling["legal_balls"].replace(0, np.nan)
+        bowling["overs_bowled"]        = bowling["legal_balls"] / 6
+        bowling["economy_rate"]        = (bowling["runs_conceded"] / (legal / 6)).round(2)
+        bowling["dot_ball_percentage"] = (bowling["dot_balls"] / legal * 100).round(2)
+
+
+def _scope_name(season, team):
+    if season is not None and team is not None:
+        return "season_team"
+    if season is not None:
+        return "season"
+    if team is not None:
+        return "team"
+    return "overall"
+
+
+# ─────────────────────────────────────────────────────────
+# 2. LEADERBOARD INDEX
+# ─────────────────────────────────────────────────────────
+class LeaderboardIndex:
+    """Ranked indexes per metric for the overall, per-season and
+    per-team scopes. Each ranked index is sorted once at build time;
+    a query only masks by threshold and slices the first k entries.
+    Un-indexed scopes (season + team) fall back to argpartition."""
+
+    def __init__(self, deliveries, k=TOP_K):
+        self.k = k
+        self._counts = dict(zip(("batsman", "bowler"), build_player_counts(deliveries)))
+        self.seasons = sorted(pd.concat([c["season"] for c in self._counts.values()]).dropna().unique())
+        self.teams   = sorted(pd.concat([c["team"]   for c in self._counts.values()]).dropna().unique())
+
+        self._ranked = {}   # (metric, season, team) → (players, values, qualifiers)
+        self._cache  = {}   # (metric, season, team, min_qualifier, k) → DataFrame
+
+        scopes = [(None, None)] + [(s, None) for s in self.seasons] + [(None, t) for t in self.teams]
+        for season, team in scopes:
+            tables = {role: self._scope_table(role, season, team) for role in self._counts}
+            for metric, spec in LEADERBOARD_METRICS.items():
+                self._ranked[(metric, season, team)] = self._rank(tables[spec["role"]], metric)
+                for threshold in spec["thresholds"]:
+                    self.top_k(metric, k=k, min_qualifier=threshold, season=season, team=team)
+
+    def _scope_table(self, role, season=None, team=None):
+        counts = self._counts[role]
+        if season is not None:
+            counts = counts[counts["season"] == season]
+        if team is not None:
+            counts = counts[counts["team"] == team]
+        table = counts.drop(columns=["season", "team"]).groupby("player").sum().reset_index()
+        if role == "batsman":
+            add_rate_columns(batting=table)
+        else:
+            add_rate_columns(bowling=table)
+        return table
+
+    @staticmethod
+    def _rank(table, metric):
+        spec   = LEADERBOARD_METRICS[metric]
+        values = table[metric].to_numpy(dtype=float)
+        # NaN sorts last in both directions
+        order  = np.argsort(values if spec["ascending"] else -values, kind="stable")
+        return (table["player"].to_numpy()[order],
+                values[order],
+                table[spec["qualifier"]].to_numpy(dtype=float)[order])
+
+    def top_k(self, metric, k=None, min_qualifier=None, season=None, team=None):
+        """Top-k players for `metric` among those whose qualifier column
+        (balls faced / overs / legal balls) is at least `min_qualifier`."""
+        if metric not in LEADERBOARD_METRICS:
+            raise KeyError(f"Unknown leaderboard metric: {metric!r}")
+        spec = LEADERBOARD_METRICS[metric]
+        k = self.k if k is None else k
+        min_qualifier = spec["thresholds"][-1] if min_qualifier is None else min_qualifier
+
+        key = (metric, season, team, min_qualifier, k)
+        if key in self._cache:
+            return self._cache[key].copy()
+
+        ranked = self._ranked.get((metric, season, team))
+        if ranked is not None:
+            players, values, qualifiers = ranked
+            hits = np.flatnonzero((qualifiers >= min_qualifier) & ~np.isnan(values))[:k]
+        else:
+            table = self._scope_table(spec["role"], season, team)
+            values     = table[metric].to_numpy(dtype=float)
+            qualifiers = table[spec["qualifier"]].to_numpy(dtype=float)
+            players    = table["player"].to_numpy()
+            candidates = np.flatnonzero((qualifiers >= min_qualifier) & ~np.isnan(values))
+            sort_key   = values[candidates] if spec["ascending"] else -values[candidates]
+            if len(candidates) > k:
+                keep = np.argpartition(sort_key, k - 1)[:k]
+                candidates, sort_key = candidates[keep], sort_key[keep]
+            hits = candidates[np.argsort(sort_key, kind="stable")]
+
+        result = pd.DataFrame({
+            "rank"             : np.arange(1, len(hits) + 1),
+            "player"           : players[hits],
+            metric             : values[hits],
+            spec["qualifier"]  : qualifiers[hits],
+        })
+        self._cache[key] = result
+        return result.copy()
+
+    def precomputed(self):
+        """All cached leaderboards stacked into one long table (for export)."""
+        frames = []
+        for (metric, season, team, min_qualifier, k), board in self._cache.items():
+            spec = LEADERBOARD_METRICS[metric]
+            frames.append(pd.DataFrame({
+                "metric"          : metric,
+                "scope"           : _scope_name(season, team),
+                "season"          : season,
+                "team"            : team,
+                "qualifier"       : spec["qualifier"],
+                "min_qualifier"   : min_qualifier,
+                "rank"            : board["rank"],
+                "player"          : board["player"],
+                "value"           : board[metric],
+                "qualifier_value" : board[spec["qualifier"]],
+            }))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,264 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - PLAYER SIMILARITY MODULE
+  Module: similarity.py
+  Description: Nearest-neighbour search over player KPI feature
+               vectors (batting and bowling), restricted to any
+               season window, with batch queries.
+============================================================
+
+Features (definitions match KPI 4–7 and Fact_Batsman / Fact_Bowler):
+  Batsman : strike rate, boundary %, dot % faced, share of balls
+            and strike rate in powerplay / middle / death overs
+  Bowler  : economy, dot ball %, wickets per 100 balls, share of
+            balls and economy in powerplay / middle / death overs
+
+Search:
+  Features are z-scored within the window and L2-normalised; the
+  index answers cosine top-k with blocked matrix products (one
+  query batch × one block of players at a time) and argpartition,
+  never a full pairwise sort.
+
+Usage:
+  from similarity import PlayerSimilarity
+  sim = PlayerSimilarity(deliveries)
+  sim.most_similar(["V Kohli", "S Dhawan"], role="batsman", k=20, seasons=(2016, 2019))
+
+  python scripts/similarity.py "V Kohli" --role batsman --k 20 --seasons 2016 2019
+============================================================
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import os
+
+from cleaning_rules import BOWLER_WICKETS
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
+
+PHASES     = ["powerplay", "middle", "death"]     # overs 1–6, 7–15, 16–20
+MIN_BALLS  = 120        # balls faced / legal balls bowled within the window
+BLOCK_SIZE = 4096       # indexed players per matrix-product block
+TOP_K      = 20
+
+BATTING_FEATURES = (["strike_rate", "boundary_percentage", "dot_percentage"]
+                    + [f"{p}_share" for p in PHASES] + [f"{p}_strike_rate" for p in PHASES])
+BOWLING_FEATURES = (["economy_rate", "dot_ball_percentage", "wickets_per_100_balls"]
+                    + [f"{p}_share" for p in PHASES] + [f"{p}_economy" for p in PHASES])
+
+
+def over_phase(over):
+    return np.select([over <= 6, over <= 15], PHASES[:2], PHASES[2])
+
+
+# ─────────────────────────────────────────────────────────
+# 1. PLAYER × SEASON × PHASE COUNTS
+# ─────────────────────────────────────────────────────────
+def _by_phase(frame, keys, **aggs):
+    """Group by keys + phase and widen to <stat>_<phase> columns."""
+    table = frame.groupby(keys + ["phase"]).agg(**aggs).unstack("phase", fill_value=0)
+    table = table.reindex(columns=pd.MultiIndex.from_product([list(aggs), PHASES]), fill_value=0)
+    table.columns = [f"{stat}_{phase}" for stat, phase in table.columns]
+    return table.reset_index()
+
+
+def build_season_counts(deliveries):
+    """Additive batting / bowling counts at player × season grain."""
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+    d = deliveries.assign(phase=over_phase(deliveries["over"].to_numpy()))
+
+    non_wide = d[d["wide_runs"] == 0]
+    batting = _by_phase(
+        non_wide.assign(boundary=non_wide["batsman_runs"].isin([4, 6]).astype(int),
+                        dot=(non_wide["batsman_runs"] == 0).astype(int)),
+        [bat_col, "season"],
+        runs=("batsman_runs", "sum"), balls=("ball", "count"),
+        boundaries=("boundary", "sum"), dots=("dot", "sum"),
+    ).rename(columns={bat_col: "player"})
+
+    is_legal = (d["wide_runs"] == 0) & (d["noball_runs"] == 0)
+    bowling = _by_phase(
+        d.assign(legal=is_legal.astype(int),
+                 dot=(is_legal & (d["total_runs"] == 0)).astype(int),
+                 wicket=d["dismissal_kind"].isin(BOWLER_WICKETS).astype(int)),
+        ["bowler", "season"],
+        runs=("total_runs", "sum"), balls=("legal", "sum"),
+        dots=("dot", "sum"), wickets=("wicket", "sum"),
+    ).rename(columns={"bowler": "player"})
+
+    return batting, bowling
+
+
+def _total(table, stat):
+    return table[[f"{stat}_{p}" for p in PHASES]].sum(axis=1)
+
+
+def batting_features(counts):
+    balls = _total(counts, "balls")
+    feats = pd.DataFrame({
+        "player"              : counts["player"],
+        "balls"               : balls,
+        "strike_rate"         : _total(counts, "runs") / balls * 100,
+        "boundary_percentage" : _total(counts, "boundaries") / balls * 100,
+        "dot_percentage"      : _total(counts, "dots") / balls * 100,
+    })
+    for p in PHASES:
+        feats[f"{p}_share"] = counts[f"balls_{p}"] / balls
+        # no balls in a phase → fall back to overall strike rate
+        feats[f"{p}_strike_rate"] = (counts[f"runs_{p}"] / counts[f"balls_{p}"].where(counts[f"balls_{p}"] > 0)
+                                     * 100).fillna(feats["strike_rate"])
+    return feats
+
+
+def bowling_features(counts):
+    balls = _total(counts, "balls")
+    feats = pd.DataFrame({
+        "player"                : counts["player"],
+        "balls"                 : balls,
+        "economy_rate"          : _total(counts, "runs") / balls * 6,
+        "dot_ball_percentage"   : _total(counts, "dots") / balls * 100,
+        "wickets_per_100_balls" : _total(counts, "wickets") / balls * 100,
+    })
+    for p in PHASES:
+        feats[f"{p}_share"] = counts[f"balls_{p}"] / balls
+        feats[f"{p}_economy"] = (counts[f"runs_{p}"] / counts[f"balls_{p}"].where(counts[f"balls_{p}"] > 0)
+                                 * 6).fillna(feats["economy_rate"])
+    return feats
+
+
+# ─────────────────────────────────────────────────────────
+# 2. BLOCKED COSINE INDEX
+# ─────────────────────────────────────────────────────────
+class CosineIndex:
+    """Top-k cosine search over z-scored, L2-normalised feature rows."""
+
+    def __init__(self, names, matrix, block_size=BLOCK_SIZE):
+        matrix = np.asarray(matrix, dtype=float)
+        self.mean  = matrix.mean(axis=0)
+        self.std   = matrix.std(axis=0)
+        self.std[self.std == 0] = 1.0
+        self.names = np.asarray(names)
+        self.block_size = block_size
+        self._pos  = {name: i for i, name in enumerate(self.names)}
+        self.vectors = self._normalise(matrix)
+
+    def _normalise(self, matrix):
+        z = (np.asarray(matrix, dtype=float) - self.mean) / self.std
+        norms = np.linalg.norm(z, axis=1, keepdims=True)
+        return z / np.where(norms == 0, 1.0, norms)
+
+    def __contains__(self, name):
+        return name in self._pos
+
+    def search(self, queries, k=TOP_K, exclude=None):
+        """Cosine top-k for each query row (already normalised).
+        `exclude` optionally gives one index row per query to skip
+        (the query player itself). Returns (indices, scores), each
+        of shape (n_queries, k), best first."""
+        n_q = len(queries)
+        k   = min(k, len(self.names) - (exclude is not None))
+        best_idx   = np.empty((n_q, 0), dtype=int)
+        best_score = np.empty((n_q, 0))
+
+        for start in range(0, len(self.vectors), self.block_size):
+            block  = self.vectors[start:start + self.block_size]
+            scores = queries @ block.T
+            if exclude is not None:
+                own = (exclude >= start) & (exclude < start + len(block))
+                scores[own, exclude[own] - start] = -np.inf
+            idx    = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            # merge this block's candidates with the running top-k
+            cand_s = np.hstack([best_score, scores])
+            cand_i = np.hstack([best_idx, idx])
+            if cand_s.shape[1] > k:
+                keep   = np.argpartition(-cand_s, k - 1, axis=1)[:, :k]
+                cand_s = np.take_along_axis(cand_s, keep, axis=1)
+                cand_i = np.take_along_axis(cand_i, keep, axis=1)
+            best_score, best_idx = cand_s, cand_i
+
+        order = np.argsort(-best_score, axis=1, kind="stable")
+        return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_score, order, axis=1)
+
+    def query(self, names, k=TOP_K):
+        """Top-k most similar indexed players for each indexed name."""
+        rows = np.array([self._pos[n] for n in names], dtype=int)
+        return self.search(self.vectors[rows], k=k, exclude=rows)
+
+
+# ─────────────────────────────────────────────────────────
+# 3. PLAYER SIMILARITY (SEASON WINDOWS + BATCH QUERIES)
+# ─────────────────────────────────────────────────────────
+class PlayerSimilarity:
+    """Builds (and caches) one CosineIndex per role × season window."""
+
+    def __init__(self, deliveries, min_balls=MIN_BALLS):
+        self.min_balls = min_balls
+        self._counts   = dict(zip(("batsman", "bowler"), build_season_counts(deliveries)))
+        self._indexes  = {}
+
+    def features(self, role, seasons=None):
+        """Feature table for `role` over an inclusive (first, last) season window."""
+        counts = self._counts[role]
+        if seasons is not None:
+            counts = counts[counts["season"].between(*seasons)]
+        counts = counts.drop(columns="season").groupby("player").sum().reset_index()
+        feats  = batting_features(counts) if role == "batsman" else bowling_features(counts)
+        return feats[feats["balls"] >= self.min_balls].reset_index(drop=True)
+
+    def index(self, role, seasons=None):
+        key = (role, tuple(seasons) if seasons is not None else None)
+        if key not in self._indexes:
+            feats   = self.features(role, seasons)
+            columns = BATTING_FEATURES if role == "batsman" else BOWLING_FEATURES
+            self._indexes[key] = CosineIndex(feats["player"], feats[columns])
+        return self._indexes[key]
+
+    def most_similar(self, players, role="batsman", k=TOP_K, seasons=None):
+        """Top-k similar players for one name or a list of names.
+        Names without enough balls in the window are skipped."""
+        if isinstance(players, str):
+            players = [players]
+        if role not in self._counts:
+            raise ValueError(f"role must be 'batsman' or 'bowler', got {role!r}")
+        index = self.index(role, seasons)
+        found = [p for p in players if p in index]
+        if not found:
+            return pd.DataFrame(columns=["query", "rank", "player", "similarity"])
+
+        idx, scores = index.query(found, k=k)
+        return pd.DataFrame({
+            "query"      : np.repeat(found, idx.shape[1]),
+            "rank"       : np.tile(np.arange(1, idx.shape[1] + 1), len(found)),
+            "player"     : index.names[idx.ravel()],
+            "similarity" : scores.ravel().round(4),
+        })
+
+
+# ─────────────────────────────────────────────────────────
+# 4. COMMAND LINE
+# ─────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Find players with similar KPI profiles")
+    parser.add_argument("players", nargs="+", help="player name(s) to query")
+    parser.add_argument("--role", choices=["batsman", "bowler"], default="batsman")
+    parser.add_argument("--k", type=int, default=TOP_K)
+    parser.add_argument("--seasons", type=int, nargs=2, metavar=("FIRST", "LAST"))
+    parser.add_argument("--min-balls", type=int, default=MIN_BALLS)
+    args = parser.parse_args()
+
+    deliveries = pd.read_csv(os.path.join(PROCESSED_DIR, "deliveries_enriched.csv"))
+    sim = PlayerSimilarity(deliveries, min_balls=args.min_balls)
+    result = sim.most_similar(args.players, role=args.role, k=args.k, seasons=args.seasons)
+
+    missing = [p for p in args.players if p not in set(result["query"])]
+    for p in missing:
+        print(f"  ⚠️  {p}: not found or under {args.min_balls} balls in the window")
+    print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+============================================================
+  IPL PERFORMANCE ANALYTICS - MONTE CARLO MATCH SIMULATOR
+  Module: simulator.py
+  Description: Simulates full T20 matches between two XIs at a
+               venue from per-ball outcome distributions estimated
+               on deliveries, and reports win probabilities and
+               score distributions.
+============================================================
+
+Outcome model:
+  Every delivery is one of OUTCOMES (dot, 1–6 runs, wide, no-ball,
+  bye, leg-bye, or a wicket by kind). Counts are tabulated per over
+  phase (powerplay / middle / death) overall and per batsman, bowler
+  and venue. Each entity's distribution is shrunk toward the phase
+  baseline (PRIOR_BALLS pseudo-balls) and the three are combined as
+  baseline × Π(entity / baseline), renormalised. The tables are
+  cached in data/processed/cache/ and rebuilt only when
+  deliveries_enriched.csv changes.
+
+Simulation:
+  All simulations in a shard advance in lockstep as NumPy arrays
+  (score, wickets, legal balls, striker, non-striker); one loop step
+  bowls one delivery in every unfinished simulation. Shards run in a
+  process pool, each with a child seed spawned from the run seed, so
+  results do not depend on the number of workers.
+
+Usage:
+  python scripts/simulator.py --team1 "Mumbai Indians" --team2 "Chennai Super Kings" \\
+         --venue "Wankhede Stadium" --sims 50000
+============================================================
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cleaning_rules import TEAM_NAME_MAP
+
+# ─────────────────────────────────────────────────────────
+# 0. CONFIGURATION
+# ─────────────────────────────────────────────────────────
+PROCESSED_DIR   = os.path.join(os.path.dirname(__file__), "..", "data", "processed")
+DELIVERIES_FILE = os.path.join(PROCESSED_DIR, "deliveries_enriched.csv")
+CACHE_FILE      = os.path.join(PROCESSED_DIR, "cache", "outcome_tables.pkl")
+SIM_DIR         = os.path.join(PROCESSED_DIR, "simulations")
+
+N_SIMS      = 20000
+SHARD_SIZE  = 5000
+N_WORKERS   = os.cpu_count() or 1
+SIM_SEED    = 2026
+PRIOR_BALLS = {"batsman": 60, "bowler": 60, "venue": 300}
+
+PHASES   = ["powerplay", "middle", "death"]     # overs 1–6, 7–15, 16–20
+OUTCOMES = ["0", "1", "2", "3", "4", "5", "6", "wide", "noball", "bye", "legbye",
+            "caught", "bowled", "lbw", "run out", "other_wicket"]
+WICKET_OUTCOMES = ["caught", "bowled", "lbw", "run out", "other_wicket"]
+EXTRA_OUTCOMES  = ["wide", "noball", "bye", "legbye"]
+
+MAX_OVERS = 20
+XI_SIZE   = 11
+# Five bowlers × four overs; no bowler bowls consecutive overs
+BOWLING_PLAN = np.array([0, 1, 0, 1, 2, 3, 2, 3, 4, 2, 4, 3, 4, 2, 3, 4, 0, 1, 0, 1])
+
+
+# ─────────────────────────────────────────────────────────
+# 1. OUTCOME TABLES (CACHED)
+# ─────────────────────────────────────────────────────────
+def classify_outcomes(deliveries):
+    """Map each delivery to its OUTCOMES label."""
+    kind = deliveries["dismissal_kind"].fillna("not out")
+    wicket_kind = np.where(kind.isin(["caught", "caught and bowled"]), "caught",
+                  np.where(kind.isin(["bowled", "lbw", "run out"]), kind, "other_wicket"))
+    runs = deliveries["batsman_runs"].clip(0, 6).astype(int).astype(str)
+    label = np.select(
+        [kind != "not out",
+         deliveries["wide_runs"] > 0, deliveries["noball_runs"] > 0,
+         deliveries["bye_runs"] > 0, deliveries["legbye_runs"] > 0],
+        [wicket_kind, "wide", "noball", "bye", "legbye"],
+        runs,
+    )
+    return pd.Series(label, index=deliveries.index)
+
+
+def build_outcome_tables(deliveries):
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+    over    = deliveries["over"].to_numpy()
+    d = deliveries.assign(
+        outcome = classify_outcomes(deliveries),
+        phase   = np.select([over <= 6, over <= 15], PHASES[:2], PHASES[2]),
+    )
+
+    def counts(keys):
+        table = d.groupby(keys + ["outcome"]).size().unstack("outcome", fill_value=0)
+        return table.reindex(columns=OUTCOMES, fill_value=0)
+
+    # Runs credited to the batting side per outcome (extras: rounded mean)
+    runs = pd.Series({o: int(o) for o in OUTCOMES[:7]} | {o: 0 for o in WICKET_OUTCOMES})
+    extra_runs = d[d["outcome"].isin(EXTRA_OUTCOMES)].groupby("outcome")["total_runs"].mean()
+    for o in EXTRA_OUTCOMES:
+        runs[o] = max(1, int(round(extra_runs.get(o, 1))))
+
+    return {
+        "base"    : counts(["phase"]).reindex(PHASES, fill_value=0),
+        "batsman" : counts([bat_col, "phase"]),
+        "bowler"  : counts(["bowler", "phase"]),
+        "venue"   : counts(["venue", "phase"]),
+        "runs"    : runs.reindex(OUTCOMES).to_numpy(),
+    }
+
+
+def load_outcome_tables(path=DELIVERIES_FILE, cache_file=CACHE_FILE):
+    """Outcome tables from the cache, rebuilt if the deliveries file changed."""
+    stat      = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    if os.path.exists(cache_file):
+        cached = pd.read_pickle(cache_file)
+        if cached.get("signature") == signature:
+            return cached["tables"]
+
+    cols = ["batter", "batsman", "bowler", "venue", "over", "wide_runs", "noball_runs",
+            "bye_runs", "legbye_runs", "batsman_runs", "total_runs", "dismissal_kind"]
+    deliveries = pd.read_csv(path, usecols=lambda c: c in cols)
+    tables = build_outcome_tables(deliveries)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    pd.to_pickle({"signature": signature, "tables": tables}, cache_file)
+    return tables
+
+
+def _entity_probs(table, names, base_p, prior):
+    """(len(names), phases, outcomes) distributions shrunk toward base_p."""
+    idx = pd.MultiIndex.from_product([names, PHASES])
+    c = table.reindex(idx, fill_value=0).to_numpy(dtype=float).reshape(len(names), len(PHASES), -1)
+    return (c + prior * base_p) / (c.sum(axis=-1, keepdims=True) + prior)
+
+
+def outcome_cdf(tables, batters, bowlers, venue):
+    """Cumulative outcome distribution per (batter, bowler, phase):
+    shape (len(batters), len(bowlers), phases, outcomes)."""
+    base   = tables["base"].to_numpy(dtype=float) + 1.0
+    base_p = base / base.sum(axis=1, keepdims=True)                      # (phases, C)
+
+    bat = _entity_probs(tables["batsman"], batters,  base_p, PRIOR_BALLS["batsman"]) / base_p
+    bwl = _entity_probs(tables["bowler"],  bowlers,  base_p, PRIOR_BALLS["bowler"])  / base_p
+    ven = _entity_probs(tables["venue"],   [venue],  base_p, PRIOR_BALLS["venue"])[0] / base_p
+
+    p = base_p * ven * bat[:, None] * bwl[None, :]
+    p /= p.sum(axis=-1, keepdims=True)
+    cdf = np.cumsum(p, axis=-1)
+    cdf[..., -1] = 1.0
+    return cdf
+
+
+# ─────────────────────────────────────────────────────────
+# 2. LOCKSTEP INNINGS SIMULATION
+# ─────────────────────────────────────────────────────────
+_LEGAL  = ~np.isin(OUTCOMES, ["wide", "noball"])
+_WICKET = np.isin(OUTCOMES, WICKET_OUTCOMES)
+
+
+def simulate_innings(cdf, runs_per_outcome, n, rng, target=None):
+    """Bowl one innings in n simulations at once. Returns (runs, wickets, legal_balls)."""
+    n_batters = cdf.shape[0]
+    score   = np.zeros(n, dtype=np.int64)
+    wickets = np.zeros(n, dtype=np.int64)
+    legal   = np.zeros(n, dtype=np.int64)
+    striker = np.zeros(n, dtype=np.int64)
+    other   = np.ones(n, dtype=np.int64)
+    live    = np.ones(n, dtype=bool)
+    max_wkts = min(10, n_batters - 1)
+
+    while live.any():
+        sims  = np.flatnonzero(live)
+        over  = legal[sims] // 6
+        phase = np.where(over < 6, 0, np.where(over < 15, 1, 2))
+        probs = cdf[striker[sims], BOWLING_PLAN[over], phase]            # (live, C)
+        outcome = (rng.random(len(sims))[:, None] > probs).sum(axis=1)
+
+        ball_runs = runs_per_outcome[outcome]
+        is_legal  = _LEGAL[outcome]
+        is_out    = _WICKET[outcome]
+        score[sims]   += ball_runs
+        legal[sims]   += is_legal
+        wickets[sims] += is_out
+
+        # new batter replaces the dismissed striker; odd runs run (not the
+        # wide / no-ball penalty) or the end of an over swap ends
+        s = striker[sims]
+        s = np.where(is_out, np.minimum(wickets[sims] + 1, n_batters - 1), s)
+        o = other[sims]
+        ran  = np.where(is_legal, ball_runs, 0) % 2 == 1
+        swap = (~is_out & ran) ^ (is_legal & (legal[sims] % 6 == 0))
+        striker[sims], other[sims] = np.where(swap, o, s), np.where(swap, s, o)
+
+        done = (wickets[sims] >= max_wkts) | (legal[sims] >= MAX_OVERS * 6)
+        if target is not None:
+            done |= score[sims] >= target[sims]
+        live[sims[done]] = False
+
+    return score, wickets, legal
+
+
+def simulate_shard(task):
+    """One shard of full matches. `task` = (cdf_1, cdf_2, runs, n, seed_seq)."""
+    cdf_1, cdf_2, runs_per_outcome, n, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    runs_1, wkts_1, _ = simulate_innings(cdf_1, runs_per_outcome, n, rng)
+    runs_2, wkts_2, _ = simulate_innings(cdf_2, runs_per_outcome, n, rng, target=runs_1 + 1)
+    return runs_1, wkts_1, runs_2, wkts_2
+
+
+# ─────────────────────────────────────────────────────────
+# 3. MATCH SIMULATION + REPORT
+# ─────────────────────────────────────────────────────────
+def select_bowlers(tables, xi, n=5):
+    """The n players in the XI with the most balls bowled historically."""
+    bowled = tables["bowler"].groupby(level=0).sum().sum(axis=1)
+    ranked = sorted(xi, key=lambda p: -bowled.get(p, 0))
+    return (ranked * n)[:n] if ranked else ranked
+
+
+def recent_xi(deliveries, team):
+    """Batting order + bowlers used by `team` in its most recent match,
+    topped up from earlier matches (latest first) when that match was
+    too short to field XI_SIZE players (washout, early finish)."""
+    bat_col = "batter" if "batter" in deliveries.columns else "batsman"
+    played  = deliveries[(deliveries["batting_team"] == team) | (deliveries["bowling_team"] == team)]
+    if played.empty:
+        raise ValueError(f"No deliveries found for team {team!r}")
+
+    xi = []
+    recent = played[["date", "match_id"]].drop_duplicates().sort_values(["date", "match_id"], ascending=False)
+    for match_id in recent["match_id"]:
+        match   = played[played["match_id"] == match_id]
+        batting = match[match["batting_team"] == team]
+        order   = pd.unique(batting[[bat_col, "non_striker"]].to_numpy().ravel())
+        bowlers = match.loc[match["bowling_team"] == team, "bowler"].unique()
+        xi += [p for p in pd.unique(np.concatenate([order, bowlers])) if p not in xi]
+        if len(xi) >= XI_SIZE:
+            return xi[:XI_SIZE]
+    raise ValueError(f"Only {len(xi)} players found for team {team!r}; pass the XI explicitly")
+
+
+def check_xi(xi, label):
+    """An XI needs XI_SIZE distinct players, or innings end early (n − 1 wickets)."""
+    if len(set(xi)) < XI_SIZE:
+        raise ValueError(f"{label} has {len(set(xi))} distinct players; {XI_SIZE} are required")
+
+
+def simulate_match(tables, xi_1, xi_2, venue, n_sims=N_SIMS, seed=SIM_SEED,
+                   shard_size=SHARD_SIZE, n_workers=N_WORKERS):
+    """Team 1 (xi_1, in batting order) bats first. Returns per-simulation results."""
+    check_xi(xi_1, "xi_1")
+    check_xi(xi_2, "xi_2")
+    cdf_1 = outcome_cdf(tables, xi_1, select_bowlers(tables, xi_2), venue)
+    cdf_2 = outcome_cdf(tables, xi_2, select_bowlers(tables, xi_1), venue)
+
+    sizes = [min(shard_size, n_sims - s) for s in range(0, n_sims, shard_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(cdf_1, cdf_2, tables["runs"], size, s) for size, s in zip(sizes, seeds)]
+
+    if n_workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            shards = list(pool.map(simulate_shard, tasks))
+    else:
+        shards = [simulate_shard(task) for task in tasks]
+
+    runs_1, wkts_1, runs_2, wkts_2 = (np.concatenate(part) for part in zip(*shards))
+    return pd.DataFrame({"team1_runs": runs_1, "team1_wickets": wkts_1,
+                         "team2_runs": runs_2, "team2_wickets": wkts_2})
+
+
+def summarise(sims, team1, team2):
+    """Win probabilities and score distribution percentiles."""
+    team1_wins = (sims["team1_runs"] > sims["team2_runs"]).mean()
+    team2_wins = (sims["team2_runs"] > sims["team1_runs"]).mean()
+    win_probs = pd.DataFrame({
+        "outcome"     : [f"{team1} win", f"{team2} win", "Tie"],
+        "probability" : np.round([team1_wins, team2_wins, 1 - team1_wins - team2_wins], 4),
+    })
+
+    pct = [5, 25, 50, 75, 95]
+    rows = []
+    for team, col in [(team1, "team1"), (team2, "team2")]:
+        runs = sims[f"{col}_runs"]
+        rows.append({"team": team, "mean_runs": round(runs.mean(), 1),
+                     **{f"p{p}_runs": np.percentile(runs, p) for p in pct},
+                     "mean_wickets": round(sims[f"{col}_wickets"].mean(), 2)})
+    return win_probs, pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo match simulator")
+    parser.add_argument("--team1", required=True, help="team batting first")
+    parser.add_argument("--team2", required=True)
+    parser.add_argument("--venue", required=True)
+    parser.add_argument("--xi1", help="comma-separated XI in batting order (default: last match)")
+    parser.add_argument("--xi2", help="comma-separated XI in batting order (default: last match)")
+    parser.add_argument("--sims", type=int, default=N_SIMS)
+    parser.add_argument("--workers", type=int, default=N_WORKERS)
+    parser.add_argument("--seed", type=int, default=SIM_SEED)
+    args = parser.parse_args()
+
+    team1 = TEAM_NAME_MAP.get(args.team1, args.team1)
+    team2 = TEAM_NAME_MAP.get(args.team2, args.team2)
+
+    print("=" * 60)
+    print("  IPL Analytics — Monte Carlo Match Simulator")
+    print("=" * 60)
+
+    tables = load_outcome_tables()
+    print(f"  ✔  Outcome tables loaded ({len(tables['batsman']):,} batsman-phase rows)")
+
+    try:
+        if args.xi1 and args.xi2:
+            xi_1, xi_2 = args.xi1.split(","), args.xi2.split(",")
+        else:
+            deliveries = pd.read_csv(DELIVERIES_FILE)
+            xi_1 = args.xi1.split(",") if args.xi1 else recent_xi(deliveries, team1)
+            xi_2 = args.xi2.split(",") if args.xi2 else recent_xi(deliveries, team2)
+        xi_1, xi_2 = [p.strip() for p in xi_1], [p.strip() for p in xi_2]
+        check_xi(xi_1, "--xi1")
+        check_xi(xi_2, "--xi2")
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.venue not in tables["venue"].index.get_level_values(0):
+        print(f"  ⚠️  Unknown venue {args.venue!r} — using league-wide phase rates")
+
+    print(f"  ⚙️   {args.sims:,} simulations · {args.workers} worker(s) · seed {args.seed}")
+    sims = simulate_match(tables, xi_1, xi_2, args.venue, args.sims, args.seed,
+                          n_workers=args.workers)
+    win_probs, scores = summarise(sims, team1, team2)
+
+    print("\n  Win Probability:")
+    print(win_probs.to_string(index=False))
+    print("\n  Score Distribution:")
+    print(scores.to_string(index=False))
+
+    os.makedirs(SIM_DIR, exist_ok=True)
+    stem = f"{team1}_vs_{team2}".replace(" ", "_")
+    win_probs.to_csv(os.path.join(SIM_DIR, f"{stem}_win_probability.csv"), index=False)
+    scores.to_csv(os.path.join(SIM_DIR, f"{stem}_score_distribution.csv"), index=False)
+    print(f"\n  ✔  Saved → simulations/{stem}_*.csv")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()